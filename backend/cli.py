@@ -0,0 +1,73 @@
+"""
+Maintenance commands for the Dobbs backend.
+
+    python -m backend.cli import-appointments leads/appointments.json
+    python -m backend.cli import-appointments - < partner_leads.ndjson
+    python -m backend.cli rebuild-rollups
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Iterator, List, Optional
+
+from .db import create_db_and_tables, engine
+from .services.appointment_import import DEFAULT_BATCH_SIZE, import_stream_sync
+from .services.appointment_rollups import rebuild_rollups
+from .services.table_versions import bump_statement
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def _read_chunks(path: str) -> Iterator[bytes]:
+    if path == "-":
+        source = sys.stdin.buffer
+        yield from iter(lambda: source.read(READ_CHUNK_BYTES), b"")
+        return
+    with open(path, "rb") as handle:
+        yield from iter(lambda: handle.read(READ_CHUNK_BYTES), b"")
+
+
+def _import_appointments(args: argparse.Namespace) -> int:
+    create_db_and_tables()
+    report = import_stream_sync(_read_chunks(args.path), batch_size=args.batch_size)
+    print(json.dumps(report.to_dict(), indent=2))
+    return 1 if report.failed else 0
+
+
+def _rebuild_rollups(args: argparse.Namespace) -> int:
+    create_db_and_tables()
+    with engine.begin() as connection:
+        buckets = rebuild_rollups(connection)
+        # Cached and 304'd stats responses must not outlive the rebuild.
+        connection.execute(bump_statement())
+    print(json.dumps({"buckets": buckets}))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser(
+        "import-appointments",
+        help="Import legacy/partner leads from a JSON array or NDJSON file.",
+    )
+    importer.add_argument("path", help="File to import, or - for stdin.")
+    importer.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    importer.set_defaults(handler=_import_appointments)
+
+    rollups = commands.add_parser(
+        "rebuild-rollups",
+        help="Recompute the appointment stats rollups from the appointments table.",
+    )
+    rollups.set_defaults(handler=_rebuild_rollups)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
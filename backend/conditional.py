@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .metrics import metrics
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def version_validators(name: str, tracked: Optional[Tuple[int, datetime]]) -> Dict[str, str]:
+    """
+    `ETag` / `Last-Modified` headers for a table at `tracked` = (version, updated_at).
+
+    `Last-Modified` is informational only: with one-second resolution it could
+    hide a write made in the same second as a poll, so `not_modified` never
+    answers `If-Modified-Since`.
+    """
+
+    if tracked is None:
+        return {}
+    version, updated_at = tracked
+    return {
+        "ETag": f'"{name}-{version}"',
+        "Last-Modified": format_datetime(_as_utc(updated_at), usegmt=True),
+        # Let browsers and proxies keep the body but always revalidate it.
+        "Cache-Control": "no-cache",
+    }
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified(
+    request: Request,
+    validators: Dict[str, str],
+    endpoint: str,
+) -> Optional[Response]:
+    """
+    Return a 304 response if the request's `If-None-Match` still matches, else None.
+
+    `If-None-Match` takes precedence over `If-Modified-Since` (RFC 9110), and
+    requests without it always get the full response.
+    """
+
+    if not validators:
+        return None
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None or not _etag_matches(if_none_match, validators["ETag"]):
+        return None
+    metrics.increment("http_not_modified_total", endpoint=endpoint)
+    return Response(status_code=304, headers=validators)
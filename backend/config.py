@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import List
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -12,6 +12,42 @@ load_dotenv()
 DEFAULT_ELEVEN_VOICE_ID = "YOUR_DEFAULT_VOICE_ID_HERE"
 
 
+@dataclass(frozen=True)
+class ElevenLabsKeyConfig:
+    """One ElevenLabs API key and the limits we keep it within."""
+
+    api_key: str
+    max_concurrency: Optional[int] = None
+    character_quota: Optional[int] = None
+
+
+def _parse_key_pool(raw: str | None, single_key: str | None) -> Tuple[ElevenLabsKeyConfig, ...]:
+    """
+    Parse `ELEVENLABS_API_KEYS`: comma-separated `key[:max_concurrency[:character_quota]]`.
+
+    Empty limit fields mean "unlimited". `ELEVENLABS_API_KEY`, if set and not
+    already listed, joins the pool without limits.
+    """
+
+    keys: List[ElevenLabsKeyConfig] = []
+    for entry in (raw or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        api_key, *limits = entry.split(":")
+        limits += [""] * (2 - len(limits))
+        keys.append(
+            ElevenLabsKeyConfig(
+                api_key=api_key,
+                max_concurrency=int(limits[0]) if limits[0] else None,
+                character_quota=int(limits[1]) if limits[1] else None,
+            )
+        )
+    if single_key and all(key.api_key != single_key for key in keys):
+        keys.insert(0, ElevenLabsKeyConfig(api_key=single_key))
+    return tuple(keys)
+
+
 @dataclass(frozen=True)
 class Settings:
     """Centralized environment configuration for the Dobbs backend."""
@@ -20,6 +56,27 @@ class Settings:
     database_url: str
     elevenlabs_api_key: str | None
     elevenlabs_default_voice_id: str
+    tts_provider: str = "auto"
+    tts_upstream_timeout_seconds: float = 8.0
+    tts_upstream_cooldown_seconds: float = 30.0
+    tts_audio_cache_mb: int = 64
+    elevenlabs_key_pool: Tuple[ElevenLabsKeyConfig, ...] = ()
+    tts_daily_character_budget: int = 0
+    tts_client_daily_character_budget: int = 0
+    tts_trusted_proxies: Tuple[str, ...] = ()
+    sqlite_profile: str = "performance"
+    sqlite_mmap_mb: int = 256
+    sqlite_cache_mb: int = 64
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    appointment_write_mode: str = "direct"
+    appointment_group_commit_ms: float = 5.0
+    appointment_group_commit_max: int = 256
+    appointment_cache_entries: int = 1024
+    appointment_stream_buffer: int = 100
+    appointment_stream_heartbeat_seconds: float = 15.0
+    appointment_claim_ttl_seconds: float = 900.0
 
     @property
     def allowed_origins(self) -> List[str]:
@@ -42,4 +99,36 @@ def get_settings() -> Settings:
         elevenlabs_default_voice_id=os.getenv(
             "ELEVENLABS_VOICE_ID", DEFAULT_ELEVEN_VOICE_ID
         ),
+        tts_provider=os.getenv("TTS_PROVIDER", "auto").strip().lower(),
+        tts_upstream_timeout_seconds=float(os.getenv("TTS_UPSTREAM_TIMEOUT_SECONDS", "8")),
+        tts_upstream_cooldown_seconds=float(os.getenv("TTS_UPSTREAM_COOLDOWN_SECONDS", "30")),
+        tts_audio_cache_mb=int(os.getenv("TTS_AUDIO_CACHE_MB", "64")),
+        elevenlabs_key_pool=_parse_key_pool(
+            os.getenv("ELEVENLABS_API_KEYS"),
+            os.getenv("ELEVENLABS_API_KEY"),
+        ),
+        tts_daily_character_budget=int(os.getenv("TTS_DAILY_CHARACTER_BUDGET", "0")),
+        tts_client_daily_character_budget=int(
+            os.getenv("TTS_CLIENT_DAILY_CHARACTER_BUDGET", "0")
+        ),
+        tts_trusted_proxies=tuple(
+            address.strip()
+            for address in os.getenv("TTS_TRUSTED_PROXIES", "").split(",")
+            if address.strip()
+        ),
+        sqlite_profile=os.getenv("SQLITE_PROFILE", "performance").strip().lower(),
+        sqlite_mmap_mb=int(os.getenv("SQLITE_MMAP_MB", "256")),
+        sqlite_cache_mb=int(os.getenv("SQLITE_CACHE_MB", "64")),
+        sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        db_pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        appointment_write_mode=os.getenv("APPOINTMENT_WRITE_MODE", "direct").strip().lower(),
+        appointment_group_commit_ms=float(os.getenv("APPOINTMENT_GROUP_COMMIT_MS", "5")),
+        appointment_group_commit_max=int(os.getenv("APPOINTMENT_GROUP_COMMIT_MAX", "256")),
+        appointment_cache_entries=int(os.getenv("APPOINTMENT_CACHE_ENTRIES", "1024")),
+        appointment_stream_buffer=int(os.getenv("APPOINTMENT_STREAM_BUFFER", "100")),
+        appointment_stream_heartbeat_seconds=float(
+            os.getenv("APPOINTMENT_STREAM_HEARTBEAT_SECONDS", "15")
+        ),
+        appointment_claim_ttl_seconds=float(os.getenv("APPOINTMENT_CLAIM_TTL_SECONDS", "900")),
     )
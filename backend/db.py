@@ -2,11 +2,70 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Tuple
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .config import get_settings
+from .config import Settings, get_settings
+from .migrations import run_migrations
+
+
+def sqlite_pragmas(settings: Settings) -> Dict[str, Any]:
+    """
+    Per-connection PRAGMAs for the configured `SQLITE_PROFILE`.
+
+    "performance" switches to WAL (readers no longer block on the writer),
+    relaxes fsync to checkpoints, and gives each connection a larger page
+    cache and memory map. "default" only sets the busy timeout.
+    """
+
+    pragmas: Dict[str, Any] = {"busy_timeout": settings.sqlite_busy_timeout_ms}
+    if settings.sqlite_profile == "performance":
+        pragmas.update(
+            {
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",
+                "mmap_size": settings.sqlite_mmap_mb * 1024 * 1024,
+                # Negative values are KiB rather than pages.
+                "cache_size": -settings.sqlite_cache_mb * 1024,
+                "temp_store": "MEMORY",
+            }
+        )
+    return pragmas
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """Apply `pragmas` to every new DBAPI connection the engine opens."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    path = database_url.partition("://")[2].split("?", 1)[0]
+    return path in ("", "/") or ":memory:" in path or "mode=memory" in database_url
+
+
+def _engine_options(database_url: str, settings: Settings) -> Dict[str, Any]:
+    """Pool sizing for file-backed and server databases (in-memory SQLite keeps its own pool)."""
+
+    if database_url.startswith("sqlite") and _is_memory_sqlite(database_url):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": not database_url.startswith("sqlite"),
+    }
 
 
 def _build_engine():
@@ -18,17 +77,91 @@ def _build_engine():
         Path("data").mkdir(exist_ok=True)
         connect_args["check_same_thread"] = False
 
-    engine = create_engine(database_url, connect_args=connect_args)
+    engine = create_engine(
+        database_url,
+        connect_args=connect_args,
+        **_engine_options(database_url, settings),
+    )
+    if database_url.startswith("sqlite"):
+        install_sqlite_pragmas(engine, sqlite_pragmas(settings))
     return engine
 
 
+def _async_database_url(database_url: str) -> str:
+    """Swap the sync driver in `DATABASE_URL` for its asyncio counterpart."""
+
+    scheme, _, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    return database_url
+
+
+def _sqlite_read_only_url(database_url: str) -> str:
+    """Open the same SQLite file through a `mode=ro` URI."""
+
+    prefix, _, path = database_url.partition(":///")
+    path, _, query = path.partition("?")
+    extra = f"&{query}" if query else ""
+    return f"{prefix}:///file:{path}?mode=ro&uri=true{extra}"
+
+
+# Settings a read-only connection cannot (or need not) change.
+_WRITER_ONLY_PRAGMAS = ("journal_mode", "synchronous")
+
+
+def _build_async_engines() -> Tuple[AsyncEngine, AsyncEngine]:
+    """
+    Return (writer, reader) async engines.
+
+    For file-backed SQLite the writer is a single pooled connection, so writes
+    queue in the pool instead of contending for the database lock, and reads
+    use a separate `mode=ro` pool that WAL lets run alongside the writer.
+    Other databases (and in-memory SQLite) share one engine for both roles.
+    """
+
+    settings = get_settings()
+    database_url = _async_database_url(settings.database_url)
+    if not database_url.startswith("sqlite"):
+        shared = create_async_engine(database_url, **_engine_options(database_url, settings))
+        return shared, shared
+
+    Path("data").mkdir(exist_ok=True)
+    pragmas = sqlite_pragmas(settings)
+    options = _engine_options(database_url, settings)
+    if not options:
+        shared = create_async_engine(database_url)
+        install_sqlite_pragmas(shared.sync_engine, pragmas)
+        return shared, shared
+
+    writer = create_async_engine(database_url, pool_size=1, max_overflow=0)
+    install_sqlite_pragmas(writer.sync_engine, pragmas)
+    reader = create_async_engine(_sqlite_read_only_url(database_url), **options)
+    install_sqlite_pragmas(
+        reader.sync_engine,
+        {name: value for name, value in pragmas.items() if name not in _WRITER_ONLY_PRAGMAS},
+    )
+    return writer, reader
+
+
 engine = _build_engine()
+async_engine, async_read_engine = _build_async_engines()
 
 
 def create_db_and_tables() -> None:
-    """Create all SQLModel tables (idempotent)."""
+    """Create missing SQLModel tables, then apply pending schema migrations (idempotent)."""
 
     SQLModel.metadata.create_all(engine)
+    # create_all never alters existing tables; migrations bring them up to date.
+    run_migrations(engine)
+
+
+async def dispose_engines() -> None:
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -36,3 +169,17 @@ def get_session() -> Generator[Session, None, None]:
 
     with Session(engine) as session:
         yield session
+
+
+async def get_write_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an async session on the (serialized) writer."""
+
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an async session on the read-only pool."""
+
+    async with AsyncSession(async_read_engine) as session:
+        yield session
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, TypeVar
+
+from fastapi import Request
+
+from .metrics import metrics
+
+T = TypeVar("T")
+
+# nginx's "client closed request" status, logged when we abandon work.
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    """Raised when the HTTP client went away before the response was ready."""
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    awaitable: Awaitable[T],
+    endpoint: str,
+    poll_interval: float = 0.1,
+) -> T:
+    """
+    Await `awaitable`, cancelling it if the client disconnects first.
+
+    Cancellation propagates into the wrapped coroutine, so in-flight `httpx`
+    calls to upstream providers are aborted instead of running to completion.
+    """
+
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                metrics.increment("client_disconnects_total", endpoint=endpoint)
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
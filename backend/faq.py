@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -9,6 +9,8 @@ class FAQItem:
     question: str
     answer: str
     keywords: List[str]
+    # Shorter variant read aloud by TTS; `answer` is used when omitted.
+    spoken: Optional[str] = None
 
 
 FAQ_DATABASE: List[FAQItem] = [
@@ -41,6 +43,10 @@ FAQ_DATABASE: List[FAQItem] = [
             "cooper",
             "carry",
         ],
+        spoken=(
+            "We carry all the major brands, like Michelin, Goodyear and Bridgestone, and we can "
+            "track down a specific brand for you."
+        ),
     ),
     FAQItem(
         question="What services do you offer?",
@@ -51,6 +57,10 @@ FAQ_DATABASE: List[FAQItem] = [
             "maintenance to complex diagnostic repairs."
         ),
         keywords=["service", "offer", "do", "provide", "repair", "maintenance"],
+        spoken=(
+            "We handle tires, oil changes, brakes, alignments, batteries and general repair, all by "
+            "certified technicians."
+        ),
     ),
     FAQItem(
         question="How many locations do you have?",
@@ -60,6 +70,7 @@ FAQ_DATABASE: List[FAQItem] = [
             "St. Charles, St. Peters, and many more."
         ),
         keywords=["location", "where", "near", "address", "find", "close"],
+        spoken="We have over 50 locations across the Saint Louis area.",
     ),
     FAQItem(
         question="Do you offer free tire inspections?",
@@ -79,6 +90,10 @@ FAQ_DATABASE: List[FAQItem] = [
             "or club membership outlets."
         ),
         keywords=["price", "match", "guarantee", "beat", "lowest", "cheap", "cost"],
+        spoken=(
+            "We'll match any local advertised price on the same new tire, and if you find a lower "
+            "price within 30 days, we'll refund the difference plus a dollar."
+        ),
     ),
     FAQItem(
         question="How do I schedule an appointment?",
@@ -88,6 +103,7 @@ FAQ_DATABASE: List[FAQItem] = [
             "are not booked directly through this chat, but we'll make sure someone follows up with you quickly."
         ),
         keywords=["appointment", "schedule", "book", "reserve", "when"],
+        spoken="I can take your details now and our team will call you to confirm a time.",
     ),
     FAQItem(
         question="Do you offer oil change services?",
@@ -105,6 +121,7 @@ FAQ_DATABASE: List[FAQItem] = [
             "use quality parts and ensure your vehicle's braking system is safe and reliable."
         ),
         keywords=["brake", "pad", "rotor", "stop", "squeaking", "grinding"],
+        spoken="We do full brake service, from inspections and pads to rotors and fluid flushes.",
     ),
     FAQItem(
         question="Do you do wheel alignments?",
@@ -147,6 +164,7 @@ FAQ_DATABASE: List[FAQItem] = [
             "gotodobbs.com/specials to see current offers, or ask about available discounts when you call your local store."
         ),
         keywords=["special", "coupon", "deal", "discount", "promotion", "save", "offer"],
+        spoken="Yes! Check the specials page on our website, or ask your local store about current deals.",
     ),
     FAQItem(
         question="What if I need a tire size I'm not sure about?",
@@ -156,10 +174,25 @@ FAQ_DATABASE: List[FAQItem] = [
             "your driver's door jamb or in your owner's manual. What's your tire size, and I can help check availability."
         ),
         keywords=["tire size", "size", "what tire", "which tire", "sidewall", "need"],
+        spoken=(
+            "Your tire size is printed on the sidewall of your tires, or on a sticker inside the "
+            "driver's door. Tell me the size and I'll help check availability."
+        ),
     ),
 ]
 
 
+_SPOKEN_BY_ANSWER: Dict[str, str] = {
+    faq.answer: faq.spoken for faq in FAQ_DATABASE if faq.spoken
+}
+
+
+def spoken_variant(text: str) -> str:
+    """Return the spoken variant for an FAQ answer, or `text` unchanged."""
+
+    return _SPOKEN_BY_ANSWER.get(text.strip(), text)
+
+
 def search_faq(query: str, threshold: float = 0.3) -> Optional[FAQItem]:
     """Return the best FAQ match for the provided query or None."""
 
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+
 from .faq import detect_scheduling_intent
 from .models.chat import ChatResponse
+from .singleflight import SingleFlight
 
 FALLBACK_ANSWER = (
     "Thanks for reaching out! Dobbs Tire & Auto Centers handles tires, brakes, alignments, "
@@ -11,7 +14,19 @@ FALLBACK_ANSWER = (
 )
 
 
+_llm_flight: SingleFlight[ChatResponse] = SingleFlight("llm")
+
+
 async def generate_llm_response(message: str) -> ChatResponse:
+    """Generate a reply, sharing one model call among identical concurrent messages."""
+
+    key = hashlib.sha256(message.strip().encode("utf-8")).hexdigest()
+    response = await _llm_flight.do(key, lambda: _generate(message))
+    # Each caller gets its own copy so later mutation cannot leak between requests.
+    return response.model_copy(deep=True)
+
+
+async def _generate(message: str) -> ChatResponse:
     should_schedule = detect_scheduling_intent(message)
     return ChatResponse(
         text=FALLBACK_ANSWER,
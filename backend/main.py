@@ -2,16 +2,20 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from .config import get_settings
-from .db import create_db_and_tables
+from .db import create_db_and_tables, dispose_engines
+from .disconnect import CLIENT_CLOSED_REQUEST, ClientDisconnected
+from .metrics import metrics
 from .routes.appointments import router as appointments_router
 from .routes.chat import router as chat_router
 from .routes.tts import router as tts_router
+from .services.appointment_writer import get_appointment_writer
+from .services.tts_ledger import get_usage_ledger
 
 settings = get_settings()
 app = FastAPI(title="Dobbs AI Service Assistant", version="2.0.0")
@@ -25,9 +29,25 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnected) -> Response:
+    # Nobody is listening any more; the status only shows up in access logs.
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
     create_db_and_tables()
+    await get_usage_ledger().start()
+    if settings.appointment_write_mode == "group":
+        await get_appointment_writer().start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await get_appointment_writer().stop()
+    await get_usage_ledger().stop()
+    await dispose_engines()
 
 
 for prefix in ("/api", "/api/v1"):
@@ -43,6 +63,11 @@ async def health() -> dict:
     return {"ok": True}
 
 
+@app.get("/metrics", tags=["system"])
+async def metrics_snapshot() -> dict:
+    return metrics.snapshot()
+
+
 dist_dir = Path("dist/public")
 if dist_dir.exists():
     app.mount(
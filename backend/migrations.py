@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+# Key for `pg_advisory_xact_lock`, shared by every process migrating the database.
+MIGRATION_LOCK_KEY = 0x6D696772
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One forward-only schema change, applied once in its own transaction."""
+
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+# Helpers are idempotent: `create_all` already builds the current schema on a
+# fresh database, so migrations must tolerate finding their changes in place.
+
+
+def column_names(connection: Connection, table: str) -> List[str]:
+    return [column["name"] for column in inspect(connection).get_columns(table)]
+
+
+def add_column(connection: Connection, table: str, name: str, ddl: str) -> None:
+    """Add `name` with column definition `ddl` (e.g. "VARCHAR DEFAULT 'new'") if missing."""
+
+    if name not in column_names(connection, table):
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def add_generated_column(
+    connection: Connection,
+    table: str,
+    name: str,
+    type_: str,
+    expression: str,
+) -> None:
+    """
+    Add a column computed from `expression`.
+
+    SQLite can only add VIRTUAL generated columns to an existing table (they
+    can still be indexed); PostgreSQL only supports STORED ones.
+    """
+
+    storage = "STORED" if connection.dialect.name == "postgresql" else "VIRTUAL"
+    add_column(
+        connection,
+        table,
+        name,
+        f"{type_} GENERATED ALWAYS AS ({expression}) {storage}",
+    )
+
+
+def create_index(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+) -> None:
+    """Create an index (optionally unique or partial) unless it already exists."""
+
+    statement = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} "
+        f"ON {table} ({', '.join(columns)})"
+    )
+    if where:
+        statement += f" WHERE {where}"
+    connection.execute(text(statement))
+
+
+def _index_appointment_lookups(connection: Connection) -> None:
+    # Composite keyset indexes also serve created_at, location and
+    # service_type on their own (leading column).
+    create_index(connection, "ix_appointments_created_at_id", "appointments", ["created_at", "id"])
+    create_index(
+        connection,
+        "ix_appointments_location_created_at_id",
+        "appointments",
+        ["location", "created_at", "id"],
+    )
+    create_index(
+        connection,
+        "ix_appointments_service_type_created_at_id",
+        "appointments",
+        ["service_type", "created_at", "id"],
+    )
+    create_index(connection, "ix_appointments_phone", "appointments", ["phone"])
+    create_index(connection, "ix_appointments_email", "appointments", ["email"])
+
+
+def _track_appointment_versions(connection: Connection) -> None:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS table_versions ("
+            "name VARCHAR NOT NULL PRIMARY KEY, "
+            "version INTEGER NOT NULL, "
+            "updated_at TIMESTAMP NOT NULL)"
+        )
+    )
+    connection.execute(
+        text(
+            "INSERT INTO table_versions (name, version, updated_at) "
+            "SELECT 'appointments', 0, :now "
+            "WHERE NOT EXISTS (SELECT 1 FROM table_versions WHERE name = 'appointments')"
+        ),
+        {"now": datetime.utcnow()},
+    )
+
+
+def _log_appointment_changes(connection: Connection) -> None:
+    seq = "SERIAL" if connection.dialect.name == "postgresql" else "INTEGER"
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS appointment_changes ("
+            f"seq {seq} NOT NULL PRIMARY KEY, "
+            "appointment_id INTEGER NOT NULL, "
+            "op VARCHAR NOT NULL, "
+            "changed_at TIMESTAMP NOT NULL)"
+        )
+    )
+    create_index(
+        connection,
+        "ix_appointment_changes_appointment_id",
+        "appointment_changes",
+        ["appointment_id"],
+    )
+    # Existing rows enter the feed as creates, in creation order, so a
+    # consumer starting from 0 sees the whole table.
+    connection.execute(
+        text(
+            "INSERT INTO appointment_changes (appointment_id, op, changed_at) "
+            "SELECT id, 'create', created_at FROM appointments "
+            "WHERE NOT EXISTS (SELECT 1 FROM appointment_changes) "
+            "ORDER BY created_at, id"
+        )
+    )
+
+
+def _add_appointment_status(connection: Connection) -> None:
+    add_column(connection, "appointments", "status", "VARCHAR NOT NULL DEFAULT 'new'")
+    for name in ("status_changed_at", "contacted_at", "closed_at", "claimed_at"):
+        add_column(connection, "appointments", name, "TIMESTAMP")
+    add_column(connection, "appointments", "claimed_by", "VARCHAR")
+    _index_work_queue(connection)
+
+
+def _index_work_queue(connection: Connection) -> None:
+    # Partial: the work queue of uncontacted leads stays small however many
+    # closed leads accumulate. `status` leads so these outrank the composite
+    # indexes on the same columns without relying on planner statistics.
+    create_index(
+        connection,
+        "ix_appointments_new_status_location_created_at_id",
+        "appointments",
+        ["status", "location", "created_at", "id"],
+        where="status = 'new'",
+    )
+    create_index(
+        connection,
+        "ix_appointments_new_status_created_at_id",
+        "appointments",
+        ["status", "created_at", "id"],
+        where="status = 'new'",
+    )
+
+
+def _reindex_work_queue(connection: Connection) -> None:
+    # The first work-queue indexes had the same columns as the composite
+    # ones, so SQLite only picked them by index creation order.
+    for name in ("ix_appointments_new_location_created_at_id", "ix_appointments_new_created_at_id"):
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    _index_work_queue(connection)
+
+
+def _store_appointment_attributes(connection: Connection) -> None:
+    add_column(connection, "appointments", "attributes", "JSON")
+    if connection.dialect.name == "postgresql":
+        utm_source = "attributes ->> 'utm_source'"
+    else:
+        utm_source = "json_extract(attributes, '$.utm_source')"
+    add_generated_column(connection, "appointments", "utm_source", "VARCHAR", utm_source)
+    create_index(
+        connection,
+        "ix_appointments_utm_source_created_at_id",
+        "appointments",
+        ["utm_source", "created_at", "id"],
+    )
+
+
+def _roll_up_appointments(connection: Connection) -> None:
+    # Imported here: the service module pulls in the models, which
+    # migrations otherwise do not depend on.
+    from .services.appointment_rollups import rebuild_rollups
+
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS appointment_rollups ("
+            "bucket_hour TIMESTAMP NOT NULL, "
+            "location VARCHAR NOT NULL, "
+            "service_type VARCHAR NOT NULL, "
+            "leads INTEGER NOT NULL, "
+            "PRIMARY KEY (bucket_hour, location, service_type))"
+        )
+    )
+    rebuild_rollups(connection)
+
+
+def _flag_coalesced_tts_usage(connection: Connection) -> None:
+    add_column(connection, "tts_usage", "coalesced", "BOOLEAN NOT NULL DEFAULT FALSE")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Index appointment lookup and sort columns", _index_appointment_lookups),
+    Migration(2, "Track an appointments table version", _track_appointment_versions),
+    Migration(3, "Log appointment writes for the change feed", _log_appointment_changes),
+    Migration(4, "Add the appointment status workflow", _add_appointment_status),
+    Migration(5, "Store extra appointment fields", _store_appointment_attributes),
+    Migration(6, "Roll up appointment counts per hour", _roll_up_appointments),
+    Migration(7, "Lead the work-queue indexes with status", _reindex_work_queue),
+    Migration(8, "Flag coalesced TTS requests in the usage ledger", _flag_coalesced_tts_usage),
+]
+
+
+def _ensure_migrations_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+            "version INTEGER PRIMARY KEY, "
+            "description VARCHAR NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    with engine.begin() as connection:
+        _ensure_migrations_table(connection)
+        rows = connection.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))
+        return sorted(row[0] for row in rows)
+
+
+def _lock_migrations(connection: Connection) -> None:
+    """Hold the database-wide migration lock until the transaction ends."""
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    elif connection.dialect.name == "sqlite":
+        # Take the write lock up front, before the applied set is read. Each
+        # attempt waits out the busy timeout; a long migration in another
+        # worker can outlast several.
+        while True:
+            try:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                return
+            except OperationalError as exc:
+                if "locked" not in str(exc.orig):
+                    raise
+                logger.info("Waiting for another process to finish migrating")
+
+
+def _is_applied(connection: Connection, version: int) -> bool:
+    row = connection.execute(
+        text(f"SELECT 1 FROM {MIGRATIONS_TABLE} WHERE version = :version"),
+        {"version": version},
+    ).first()
+    return row is not None
+
+
+def run_migrations(engine: Engine, migrations: Sequence[Migration] = MIGRATIONS) -> List[int]:
+    """
+    Apply pending migrations in version order; return the versions applied.
+
+    Every worker runs this at startup. Each pending migration is applied under
+    a lock (`BEGIN IMMEDIATE` on SQLite, an advisory lock on PostgreSQL) and
+    re-checked once the lock is held, so concurrent workers apply it once.
+    """
+
+    done = set(applied_versions(engine))
+    applied: List[int] = []
+    for migration in sorted(migrations, key=lambda item: item.version):
+        if migration.version in done:
+            continue
+        with engine.begin() as connection:
+            _lock_migrations(connection)
+            if _is_applied(connection, migration.version):
+                continue
+            migration.apply(connection)
+            connection.execute(
+                text(
+                    f"INSERT INTO {MIGRATIONS_TABLE} (version, description, applied_at) "
+                    "VALUES (:version, :description, :applied_at)"
+                ),
+                {
+                    "version": migration.version,
+                    "description": migration.description,
+                    "applied_at": datetime.utcnow(),
+                },
+            )
+        logger.info("Applied migration %d: %s", migration.version, migration.description)
+        applied.append(migration.version)
+    return applied
@@ -1,22 +1,36 @@
 """Pydantic and SQLModel schemas used across the backend."""
 
+from .appointment_changes import AppointmentChange
+from .appointment_rollups import AppointmentRollup
 from .appointments import (
+    APPOINTMENT_STATUSES,
     Appointment,
     AppointmentBase,
+    AppointmentClaimRequest,
     AppointmentCreate,
     AppointmentRead,
+    AppointmentStatusUpdate,
     LegacyAppointmentCreate,
     LegacyAppointmentResponse,
 )
 from .chat import ChatRequest, ChatResponse
+from .table_versions import TableVersion
+from .tts_usage import TTSUsage
 
 __all__ = [
+    "APPOINTMENT_STATUSES",
     "Appointment",
+    "AppointmentChange",
+    "AppointmentRollup",
     "AppointmentBase",
+    "AppointmentClaimRequest",
     "AppointmentCreate",
     "AppointmentRead",
+    "AppointmentStatusUpdate",
     "LegacyAppointmentCreate",
     "LegacyAppointmentResponse",
     "ChatRequest",
     "ChatResponse",
+    "TableVersion",
+    "TTSUsage",
 ]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class AppointmentChange(SQLModel, table=True):
+    """
+    Change log entry written in the same transaction as the appointment write.
+
+    `seq` is the feed cursor. Sequence order is commit order: SQLite has a
+    single writer, and on PostgreSQL `record_appointment_write` serializes
+    change-log writers with an advisory lock.
+    """
+
+    __tablename__ = "appointment_changes"
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    appointment_id: int = Field(nullable=False, index=True)
+    op: str = Field(nullable=False, description="create, update or delete")
+    changed_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class AppointmentRollup(SQLModel, table=True):
+    """
+    Appointment counts per UTC hour, location and service type.
+
+    Maintained by the appointment write path in the same transaction as the
+    insert. Missing locations/service types are stored as "" so every
+    bucket has exactly one row.
+    """
+
+    __tablename__ = "appointment_rollups"
+
+    bucket_hour: datetime = Field(primary_key=True)
+    location: str = Field(default="", primary_key=True)
+    service_type: str = Field(default="", primary_key=True)
+    leads: int = Field(default=0, nullable=False)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from sqlalchemy import JSON, Column, Index, text
 from sqlmodel import Field, SQLModel
 
+# Lead lifecycle: new -> contacted -> confirmed / cancelled / no_show.
+APPOINTMENT_STATUSES: Tuple[str, ...] = ("new", "contacted", "confirmed", "cancelled", "no_show")
+
+# Upper bound on the JSON-encoded extra fields stored per appointment.
+MAX_ATTRIBUTES_BYTES = 8192
+
 
 class AppointmentBase(SQLModel):
     """Fields shared between table rows and API responses."""
@@ -21,15 +29,59 @@ class AppointmentBase(SQLModel):
     preferred_date: Optional[str] = None
     preferred_time: Optional[str] = None
     notes: Optional[str] = None
+    attributes: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON),
+        description="Extra legacy payload fields (e.g. utm_source), returned as-is.",
+    )
 
 
 class Appointment(AppointmentBase, table=True):
     """SQLModel table storing appointment requests."""
 
     __tablename__ = "appointments"
+    # Keyset pagination walks (created_at, id) newest first, optionally within
+    # a location or service type. Existing databases get these from
+    # `backend/migrations.py`.
+    __table_args__ = (
+        Index("ix_appointments_created_at_id", "created_at", "id"),
+        Index("ix_appointments_location_created_at_id", "location", "created_at", "id"),
+        Index(
+            "ix_appointments_service_type_created_at_id", "service_type", "created_at", "id"
+        ),
+        Index("ix_appointments_phone", "phone"),
+        Index("ix_appointments_email", "email"),
+        # Partial work-queue indexes: they stay small however many closed
+        # leads accumulate. Leading with `status` gives them one more equality
+        # column than the composite indexes above, so the planner prefers them
+        # for `status = 'new'` scans whether or not statistics exist.
+        Index(
+            "ix_appointments_new_status_location_created_at_id",
+            "status",
+            "location",
+            "created_at",
+            "id",
+            sqlite_where=text("status = 'new'"),
+            postgresql_where=text("status = 'new'"),
+        ),
+        Index(
+            "ix_appointments_new_status_created_at_id",
+            "status",
+            "created_at",
+            "id",
+            sqlite_where=text("status = 'new'"),
+            postgresql_where=text("status = 'new'"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    status: str = Field(default="new", nullable=False, sa_column_kwargs={"server_default": "new"})
+    status_changed_at: Optional[datetime] = None
+    contacted_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
 
 
 class AppointmentCreate(AppointmentBase):
@@ -50,7 +102,8 @@ class LegacyAppointmentCreate(BaseModel):
     Legacy request payload used by the current frontend (camelCase fields).
 
     Additional optional fields (phone, email, vehicle info) allow future enhancements
-    without breaking the existing contract.
+    without breaking the existing contract. Unknown fields are kept in the
+    `attributes` column and echoed back in responses.
     """
 
     name: str
@@ -67,10 +120,42 @@ class LegacyAppointmentCreate(BaseModel):
 
     model_config = ConfigDict(extra="allow")
 
+    @model_validator(mode="after")
+    def _bounded_extras(self) -> "LegacyAppointmentCreate":
+        if self.model_extra and len(json.dumps(self.model_extra)) > MAX_ATTRIBUTES_BYTES:
+            raise ValueError(f"Extra fields exceed {MAX_ATTRIBUTES_BYTES} bytes.")
+        return self
+
 
 class LegacyAppointmentResponse(LegacyAppointmentCreate):
     """Response model mirroring the previous JSON file format."""
 
     id: str
     createdAt: datetime
+    status: str = "new"
+    statusChangedAt: Optional[datetime] = None
+    contactedAt: Optional[datetime] = None
+    closedAt: Optional[datetime] = None
+    claimedBy: Optional[str] = None
+    claimedAt: Optional[datetime] = None
+
+
+class AppointmentStatusUpdate(BaseModel):
+    """PATCH payload moving an appointment along its lifecycle."""
+
+    status: str
+
+    @field_validator("status")
+    @classmethod
+    def _known_status(cls, value: str) -> str:
+        if value not in APPOINTMENT_STATUSES:
+            raise ValueError(f"status must be one of: {', '.join(APPOINTMENT_STATUSES)}")
+        return value
+
+
+class AppointmentClaimRequest(BaseModel):
+    """Take the oldest uncontacted lead, optionally for one location."""
+
+    staff: str
+    location: Optional[str] = None
 
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class TableVersion(SQLModel, table=True):
+    """Monotonic per-table write counter, bumped in the same transaction as each write."""
+
+    __tablename__ = "table_versions"
+
+    name: str = Field(primary_key=True)
+    version: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
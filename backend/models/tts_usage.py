@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import false
+from sqlmodel import Field, SQLModel
+
+
+class TTSUsage(SQLModel, table=True):
+    """Append-only ledger row for one text-to-speech request."""
+
+    __tablename__ = "tts_usage"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
+    client_id: str = Field(index=True)
+    characters: int
+    voice_id: Optional[str] = None
+    provider: str
+    model_id: Optional[str] = None
+    output_format: Optional[str] = None
+    latency_ms: float
+    cache_hit: bool = False
+    # Shared another request's synthesis; never billable.
+    coalesced: bool = Field(default=False, sa_column_kwargs={"server_default": false()})
@@ -1,52 +1,366 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Optional
 
-from ..db import get_session
-from ..models.appointments import LegacyAppointmentCreate, LegacyAppointmentResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..conditional import not_modified, version_validators
+from ..config import get_settings
+from ..db import get_read_session, get_write_session
+from ..disconnect import cancel_on_disconnect
+from ..models.appointments import (
+    APPOINTMENT_STATUSES,
+    AppointmentClaimRequest,
+    AppointmentStatusUpdate,
+    LegacyAppointmentCreate,
+    LegacyAppointmentResponse,
+)
 from ..services import appointment_service
+from ..services.appointment_broadcast import get_appointment_broadcaster
+from ..services.appointment_cache import get_legacy_row_cached, list_appointments_page_cached
+from ..services.appointment_changes import (
+    DEFAULT_CHANGES_LIMIT,
+    MAX_CHANGES_LIMIT,
+    MAX_WAIT_SECONDS,
+    parse_since,
+    wait_for_changes,
+)
+from ..services.appointment_export import EXPORT_FORMATS, export_appointments
+from ..services.appointment_import import import_stream
+from ..services.appointment_rollups import STATS_DIMENSIONS, appointment_stats_async
+from ..services.appointment_writer import get_appointment_writer
+from ..services.table_versions import APPOINTMENTS, current_version
 
 router = APIRouter(tags=["appointments"])
 
+_STATUS_PATTERN = f"^({'|'.join(APPOINTMENT_STATUSES)})$"
+
+# Handlers return ORJSONResponse built straight from column tuples via
+# `legacy_dict`; `response_model` is kept for the OpenAPI schema only, since
+# FastAPI does not re-validate a Response returned directly.
+
 
 @router.post(
     "/appointments",
     response_model=LegacyAppointmentResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_appointment(
+async def create_appointment(
     payload: LegacyAppointmentCreate,
-    session: Session = Depends(get_session),
-) -> LegacyAppointmentResponse:
-    record = appointment_service.create_appointment(payload, session)
-    return appointment_service.to_legacy_response(record)
+    session: AsyncSession = Depends(get_write_session),
+) -> ORJSONResponse:
+    if get_settings().appointment_write_mode == "group":
+        record = await get_appointment_writer().create(payload)
+    else:
+        record = await appointment_service.create_appointment_async(payload, session)
+    return ORJSONResponse(
+        appointment_service.legacy_dict(appointment_service.legacy_values(record)),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post("/appointments/bulk")
+async def bulk_create_appointments(request: Request) -> dict:
+    """
+    Import many leads at once from a JSON array or NDJSON body (legacy camelCase fields).
+
+    The body is parsed as it arrives and valid rows are inserted in batches,
+    one transaction per batch. Invalid rows are skipped and listed in the report.
+    """
+
+    report = await import_stream(request.stream())
+    return report.to_dict()
+
+
+@router.post(
+    "/appointments/claim",
+    response_model=LegacyAppointmentResponse,
+    responses={204: {"description": "No uncontacted lead is waiting."}},
+)
+async def claim_next_appointment(
+    payload: AppointmentClaimRequest,
+    session: AsyncSession = Depends(get_write_session),
+) -> Response:
+    """
+    Claim the oldest uncontacted lead (optionally for one location) for a staff member.
+
+    Concurrent callers always get different leads. The claim lapses after
+    `APPOINTMENT_CLAIM_TTL_SECONDS` unless the lead's status moves on.
+    """
+
+    row = await appointment_service.claim_next_async(
+        payload.staff,
+        payload.location,
+        get_settings().appointment_claim_ttl_seconds,
+        session,
+    )
+    if row is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return ORJSONResponse(appointment_service.legacy_dict(row))
 
 
 @router.get(
     "/appointments",
     response_model=list[LegacyAppointmentResponse],
 )
-def list_appointments(session: Session = Depends(get_session)) -> list[LegacyAppointmentResponse]:
-    records = appointment_service.list_appointments(session)
-    return appointment_service.to_legacy_list(records)
+async def list_appointments(
+    request: Request,
+    limit: int = Query(
+        appointment_service.DEFAULT_PAGE_SIZE, ge=1, le=appointment_service.MAX_PAGE_SIZE
+    ),
+    cursor: Optional[str] = None,
+    location: Optional[str] = None,
+    service_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    status_filter: Optional[str] = Query(None, alias="status", pattern=_STATUS_PATTERN),
+    utm_source: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+) -> ORJSONResponse:
+    """
+    Newest appointments first, one keyset page at a time.
+
+    When more rows exist, the next page's cursor is returned in `X-Next-Cursor`
+    and as a `Link: <...>; rel="next"` header. `ETag` / `Last-Modified` follow
+    the appointments table version, so unchanged polls get a 304 after a single
+    primary-key lookup.
+    """
+
+    query = appointment_service.AppointmentQuery(
+        limit=limit,
+        cursor=cursor,
+        location=location,
+        service_type=service_type,
+        created_after=created_after,
+        created_before=created_before,
+        status=status_filter,
+        utm_source=utm_source,
+    )
+    if cursor:
+        # Malformed input is a 400 even when the client's ETag still matches.
+        try:
+            appointment_service.decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    tracked = await current_version(session)
+    headers = version_validators(APPOINTMENTS, tracked)
+    unchanged = not_modified(request, headers, endpoint="appointments_list")
+    if unchanged is not None:
+        return unchanged
+
+    try:
+        rows, next_cursor = await list_appointments_page_cached(
+            query, session, tracked[0] if tracked else None
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return ORJSONResponse([appointment_service.legacy_dict(row) for row in rows], headers=headers)
+
+
+# export, changes, stats and stream are registered before /appointments/{appointment_id}
+# so their paths are not taken for an ID.
+@router.get("/appointments/export", response_class=StreamingResponse)
+async def export_appointments_endpoint(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    location: Optional[str] = None,
+    service_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    status_filter: Optional[str] = Query(None, alias="status", pattern=_STATUS_PATTERN),
+    utm_source: Optional[str] = None,
+) -> StreamingResponse:
+    """Stream all matching appointments (oldest first) for bulk sync jobs."""
+
+    query = appointment_service.AppointmentQuery(
+        location=location,
+        service_type=service_type,
+        created_after=created_after,
+        created_before=created_before,
+        status=status_filter,
+        utm_source=utm_source,
+    )
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_appointments(query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{extension}"'},
+    )
+
+
+@router.get("/appointments/changes")
+async def appointment_changes(
+    request: Request,
+    since: str = "0",
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=MAX_CHANGES_LIMIT),
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS),
+    session: AsyncSession = Depends(get_read_session),
+) -> ORJSONResponse:
+    """
+    Appointments created or modified after the `since` cursor, in commit order.
+
+    Each change carries the row's current state. Pass the returned
+    `next_cursor` as `since` to continue; with `wait`, the request is held
+    open (long-poll) until a change arrives or `wait` seconds pass.
+    """
+
+    try:
+        cursor = parse_since(since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    changes, next_cursor = await cancel_on_disconnect(
+        request,
+        wait_for_changes(session, cursor, limit, wait),
+        endpoint="appointments_changes",
+    )
+    return ORJSONResponse({"changes": changes, "next_cursor": next_cursor})
+
+
+@router.get("/appointments/stats")
+async def appointment_stats(
+    request: Request,
+    group_by: str = "",
+    location: Optional[str] = None,
+    service_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_read_session),
+) -> ORJSONResponse:
+    """
+    Lead counts from the hourly rollups, grouped by a comma-separated
+    `group_by` of location, service_type, day and/or hour (UTC). Range bounds
+    must fall on a whole hour.
+    """
+
+    dimensions = [dimension for dimension in group_by.split(",") if dimension]
+    unknown = [dimension for dimension in dimensions if dimension not in STATS_DIMENSIONS]
+    if unknown or len(set(dimensions)) != len(dimensions):
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by takes distinct values from: {', '.join(STATS_DIMENSIONS)}",
+        )
+    # Rollups are hourly; anything finer would disagree with GET /appointments.
+    for name, bound in (("created_after", created_after), ("created_before", created_before)):
+        if bound is not None and (bound.minute or bound.second or bound.microsecond):
+            raise HTTPException(status_code=400, detail=f"{name} must be on a whole hour.")
+
+    tracked = await current_version(session)
+    headers = version_validators(APPOINTMENTS, tracked)
+    unchanged = not_modified(request, headers, endpoint="appointments_stats")
+    if unchanged is not None:
+        return unchanged
+
+    stats = await appointment_stats_async(
+        session,
+        group_by=dimensions,
+        location=location,
+        service_type=service_type,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    return ORJSONResponse(stats, headers=headers)
+
+
+async def _sse_events(location: Optional[str], heartbeat: float) -> AsyncIterator[bytes]:
+    # Subscribed here rather than in the route: a generator that never starts
+    # never runs its `finally`, and the subscription would leak.
+    broadcaster = get_appointment_broadcaster()
+    subscription = broadcaster.subscribe(location)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle connection.
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield event
+    finally:
+        # Runs when the client disconnects and Starlette cancels the stream.
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get("/appointments/stream", response_class=StreamingResponse)
+async def stream_appointments(location: Optional[str] = None) -> StreamingResponse:
+    """
+    Server-sent events for newly created appointments, optionally for one location.
+
+    Each `appointment` event carries the legacy record as JSON. A consumer
+    that falls too far behind is disconnected; on reconnect it should reload
+    `GET /appointments` to catch up.
+    """
+
+    return StreamingResponse(
+        _sse_events(location, get_settings().appointment_stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get(
     "/appointments/{appointment_id}",
     response_model=LegacyAppointmentResponse,
 )
-def get_appointment(
+async def get_appointment(
     appointment_id: str,
-    session: Session = Depends(get_session),
-) -> LegacyAppointmentResponse:
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+) -> ORJSONResponse:
     try:
         numeric_id = int(appointment_id)
     except ValueError:
         raise HTTPException(status_code=404, detail="Appointment not found")
 
-    record = appointment_service.get_appointment_by_id(numeric_id, session)
-    if not record:
+    tracked = await current_version(session)
+    headers = version_validators(APPOINTMENTS, tracked)
+    # Looked up first so a missing appointment is a 404, never a 304.
+    row = await get_legacy_row_cached(numeric_id, session, tracked[0] if tracked else None)
+    if row is None:
         raise HTTPException(status_code=404, detail="Appointment not found")
-    return appointment_service.to_legacy_response(record)
+    unchanged = not_modified(request, headers, endpoint="appointments_detail")
+    if unchanged is not None:
+        return unchanged
+    return ORJSONResponse(appointment_service.legacy_dict(row), headers=headers)
 
+
+@router.patch(
+    "/appointments/{appointment_id}",
+    response_model=LegacyAppointmentResponse,
+)
+async def update_appointment_status(
+    appointment_id: str,
+    payload: AppointmentStatusUpdate,
+    session: AsyncSession = Depends(get_write_session),
+) -> ORJSONResponse:
+    """
+    Move a lead along new -> contacted -> confirmed / cancelled / no_show.
+
+    Transition timestamps are recorded; a move the current status does not
+    allow returns 409.
+    """
+
+    try:
+        numeric_id = int(appointment_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+
+    try:
+        row = await appointment_service.update_status_async(numeric_id, payload.status, session)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if row is None:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    return ORJSONResponse(appointment_service.legacy_dict(row))
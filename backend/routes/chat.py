@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
+from ..disconnect import cancel_on_disconnect
 from ..models.chat import ChatRequest, ChatResponse
 from ..services.chat_service import handle_chat_message
+from ..services.tts_ledger import client_id_for, get_usage_ledger
 
 router = APIRouter(tags=["chat"])
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(payload: ChatRequest) -> ChatResponse:
-    result = await handle_chat_message(payload.message)
+async def chat_endpoint(payload: ChatRequest, request: Request) -> ChatResponse:
+    result = await cancel_on_disconnect(
+        request,
+        handle_chat_message(payload.message),
+        endpoint="chat",
+    )
+    # Over-budget clients get text-only replies instead of a failing /tts call.
+    should_speak = result.should_speak and get_usage_ledger().allows(client_id_for(request))
     return ChatResponse(
         text=result.answer,
-        should_speak=result.should_speak,
+        should_speak=should_speak,
         intent=result.intent,
         metadata=result.metadata,
         isSchedulingIntent=result.is_scheduling_intent,
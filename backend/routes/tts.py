@@ -1,45 +1,223 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+import json
+import time
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
-from ..tts.elevenlabs_client import synthesize_speech
+from ..disconnect import ClientDisconnected, cancel_on_disconnect
+from ..faq import spoken_variant
+from ..services.tts_ledger import client_id_for, get_usage_ledger
+from ..tts.base import SynthesisResult, iter_chunks
+from ..tts.faq_bundle import get_faq_bundle_builder
+from ..tts.formats import OutputFormat, is_mobile_client, negotiate_format
+from ..tts.key_pool import get_key_pool
+from ..tts.routing import AudioStream, get_tts_dispatcher
+from ..tts.text_normalizer import normalize_for_speech
 
 router = APIRouter(prefix="/tts", tags=["tts"])
 
 
 class TTSRequest(BaseModel):
-    """Payload accepted by the ElevenLabs-backed TTS endpoint."""
+    """Payload accepted by the TTS endpoint (ElevenLabs with local fallback)."""
 
     text: str = Field(..., max_length=2000)
     voice_id: str | None = None
+    output_format: str | None = Field(
+        default=None,
+        description="One of mp3, mp3_low, opus or pcm. Negotiated from Accept when omitted.",
+    )
+    normalize: bool = Field(
+        default=True,
+        description="Swap FAQ answers for their spoken variant and normalize text for speech.",
+    )
 
 
 # Example request payload:
 # {
 #   "text": "Your Dobbs assistant message here",
-#   "voice_id": "optional_custom_voice_id"
+#   "voice_id": "optional_custom_voice_id",
+#   "output_format": "optional: mp3 | mp3_low | opus | pcm"
 # }
-# The response is an audio/mpeg stream suitable for playback in an <audio> tag.
-@router.post("", response_class=StreamingResponse)
-async def tts_endpoint(payload: TTSRequest):
+# The response is an audio/mpeg stream suitable for playback in an <audio> tag
+# (low bitrate for mobile user agents), the negotiated Opus/PCM encoding, or
+# audio/wav when the local fallback engine handled the request.
+def _negotiate(request: Request, requested: str | None) -> OutputFormat:
+    return negotiate_format(
+        requested=requested,
+        accept=request.headers.get("accept"),
+        mobile=is_mobile_client(
+            request.headers.get("user-agent"),
+            request.headers.get("sec-ch-ua-mobile"),
+        ),
+    )
+
+
+def _prepare(payload: TTSRequest, request: Request) -> tuple[str, OutputFormat]:
     if not payload.text.strip():
         raise HTTPException(status_code=400, detail="Text must not be empty.")
 
+    text = payload.text
+    if payload.normalize:
+        text = normalize_for_speech(spoken_variant(text))
+
+    output_format = _negotiate(request, payload.output_format)
+    if not get_usage_ledger().allows(client_id_for(request), len(text)):
+        raise HTTPException(status_code=429, detail="TTS character budget exceeded.")
+    return text, output_format
+
+
+def _record_usage(
+    request: Request,
+    payload: TTSRequest,
+    text: str,
+    output_format: OutputFormat,
+    result: SynthesisResult | AudioStream,
+    started: float,
+) -> None:
+    get_usage_ledger().record(
+        client_id=client_id_for(request),
+        characters=len(text),
+        provider=result.provider,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        cache_hit=result.cache_hit,
+        coalesced=result.coalesced,
+        voice_id=payload.voice_id,
+        model_id=result.params.model_id,
+        output_format=output_format.name,
+    )
+
+
+def _audio_headers(
+    result: SynthesisResult | AudioStream,
+    output_format: OutputFormat,
+) -> dict[str, str]:
+    extension = "wav" if result.media_type == "audio/wav" else output_format.extension
+    return {
+        "Content-Disposition": f'inline; filename="dobbs_tts_response.{extension}"',
+        "X-TTS-Provider": result.provider,
+        "X-TTS-Format": output_format.name,
+        "X-TTS-Model": result.params.model_id,
+        "X-TTS-Latency-Mode": str(result.params.optimize_streaming_latency),
+    }
+
+
+@router.post("", response_class=StreamingResponse)
+async def tts_endpoint(payload: TTSRequest, request: Request):
+    text, output_format = _prepare(payload, request)
+    started = time.perf_counter()
+
+    try:
+        result = await cancel_on_disconnect(
+            request,
+            get_tts_dispatcher().synthesize(
+                text=text,
+                voice_id=payload.voice_id,
+                output_format=output_format,
+            ),
+            endpoint="tts",
+        )
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"TTS generation failed: {exc}") from exc
+
+    _record_usage(request, payload, text, output_format, result, started)
+    return StreamingResponse(
+        iter_chunks(result.audio, result.params.chunk_size),
+        media_type=result.media_type,
+        headers=_audio_headers(result, output_format),
+    )
+
+
+# Same payload as POST /tts, but audio is relayed while ElevenLabs is still
+# generating it, so playback can start after the first chunk. If the client
+# disconnects mid-stream the upstream request is closed as well.
+@router.post("/stream", response_class=StreamingResponse)
+async def tts_stream_endpoint(payload: TTSRequest, request: Request):
+    text, output_format = _prepare(payload, request)
+    started = time.perf_counter()
+
     try:
-        audio_bytes = await synthesize_speech(
-            text=payload.text,
-            voice_id=payload.voice_id,
+        stream = await cancel_on_disconnect(
+            request,
+            get_tts_dispatcher().stream(
+                text=text,
+                voice_id=payload.voice_id,
+                output_format=output_format,
+            ),
+            endpoint="tts_stream",
         )
     except HTTPException:
         raise
+    except ClientDisconnected:
+        raise
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"TTS generation failed: {exc}") from exc
 
+    # Latency for streams is time to first chunk.
+    _record_usage(request, payload, text, output_format, stream, started)
     return StreamingResponse(
-        iter([audio_bytes]),
-        media_type="audio/mpeg",
-        headers={"Content-Disposition": 'inline; filename="dobbs_tts_response.mp3"'},
+        stream.chunks,
+        media_type=stream.media_type,
+        headers=_audio_headers(stream, output_format),
+    )
+
+
+# Pre-synthesized FAQ answers for client prefetch. The manifest is small and
+# always revalidated; it points at a versioned bundle URL whose body (every FAQ
+# clip concatenated, sliced by the manifest's byte offsets) never changes and
+# can be cached indefinitely.
+@router.get("/faq-bundle")
+async def tts_faq_bundle_manifest(
+    request: Request,
+    output_format: str | None = None,
+):
+    bundle = await get_faq_bundle_builder().get(_negotiate(request, output_format))
+    etag = f'"{bundle.version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    url = request.url_for("tts_faq_bundle", version=bundle.version).include_query_params(
+        output_format=bundle.output_format
+    )
+    return Response(
+        content=json.dumps(bundle.manifest(url.path + "?" + url.query)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.get("/faq-bundle/{version}", name="tts_faq_bundle")
+async def tts_faq_bundle(version: str, request: Request, output_format: str | None = None):
+    builder = get_faq_bundle_builder()
+    bundle = await builder.get_version(_negotiate(request, output_format), version)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="FAQ audio bundle version is not available.")
+    return Response(
+        content=bundle.audio,
+        media_type="application/octet-stream",
+        headers={
+            "ETag": f'"{bundle.version}"',
+            "Cache-Control": "public, max-age=31536000, immutable",
+        },
     )
 
+
+@router.get("/keys")
+async def tts_key_usage() -> dict:
+    """Per-key usage and headroom for the ElevenLabs credential pool (keys are masked)."""
+
+    return {"keys": get_key_pool().usage()}
+
+
+@router.get("/usage")
+async def tts_usage() -> dict:
+    """Billable characters in the rolling budget window, overall and per top client (ids are masked)."""
+
+    return get_usage_ledger().summary()
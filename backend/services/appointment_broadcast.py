@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set
+
+import orjson
+
+from ..config import get_settings
+from ..metrics import metrics
+
+
+class Subscription:
+    """One stream consumer: a bounded buffer of encoded SSE events."""
+
+    def __init__(self, location: Optional[str], buffer: int) -> None:
+        self.location = location
+        # `None` ends the stream (consumer dropped for falling behind).
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=buffer)
+
+
+class AppointmentBroadcaster:
+    """
+    In-process fan-out of newly created appointments to SSE subscribers.
+
+    Each event is encoded once and handed to every matching subscriber
+    without awaiting, so a publish never blocks the write path. A subscriber
+    whose buffer is full is dropped: its backlog is discarded and its stream
+    ends, and the dashboard reconnects and catches up from the list endpoint.
+    Only subscribers of this worker process are reached.
+    """
+
+    def __init__(self, buffer: int = 100) -> None:
+        self.buffer = buffer
+        self._everywhere: Set[Subscription] = set()
+        self._by_location: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, location: Optional[str] = None) -> Subscription:
+        subscription = Subscription(location, self.buffer)
+        if location is None:
+            self._everywhere.add(subscription)
+        else:
+            self._by_location.setdefault(location, set()).add(subscription)
+        self._report()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription.location is None:
+            self._everywhere.discard(subscription)
+        else:
+            subscribers = self._by_location.get(subscription.location)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_location[subscription.location]
+        self._report()
+
+    def publish(self, location: Optional[str], item: Dict[str, Any]) -> None:
+        """Queue `item` (a legacy appointment record) for every matching subscriber."""
+
+        targets = list(self._everywhere)
+        if location is not None:
+            targets.extend(self._by_location.get(location, ()))
+        if not targets:
+            return
+        event = b"id: %s\nevent: appointment\ndata: %s\n\n" % (
+            str(item["id"]).encode("ascii"),
+            orjson.dumps(item),
+        )
+        for subscription in targets:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+                metrics.increment("appointment_stream_dropped_total")
+        metrics.increment("appointment_stream_events_total")
+
+    def _drop(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def _report(self) -> None:
+        count = len(self._everywhere) + sum(len(items) for items in self._by_location.values())
+        metrics.set_gauge("appointment_stream_subscribers", count)
+
+
+@lru_cache(maxsize=1)
+def get_appointment_broadcaster() -> AppointmentBroadcaster:
+    return AppointmentBroadcaster(buffer=max(1, get_settings().appointment_stream_buffer))
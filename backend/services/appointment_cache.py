@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, List, Optional, Tuple
+
+from sqlalchemy import Row
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from ..metrics import metrics
+from . import appointment_service
+from .appointment_service import AppointmentQuery
+
+_MISSING = object()
+
+
+class AppointmentReadCache:
+    """
+    LRU cache of appointment reads, tagged with the table version they were read at.
+
+    Every write bumps the `appointments` row in `table_versions` inside its own
+    transaction, so comparing an entry's version with the current one is exact
+    across worker processes: any create/update/delete anywhere invalidates
+    every cached page and row. Seeing a newer version drops all older entries.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._hits = {"page": 0, "row": 0}
+        self._lookups = {"page": 0, "row": 0}
+
+    def __bool__(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, kind: str, key: Hashable, version: int) -> Any:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+                value = _MISSING
+            else:
+                value = self._entries.get((kind, key), _MISSING)
+                if value is not _MISSING:
+                    self._entries.move_to_end((kind, key))
+            self._lookups[kind] += 1
+            if value is not _MISSING:
+                self._hits[kind] += 1
+            ratio = self._hits[kind] / self._lookups[kind]
+        metrics.increment(
+            "appointment_cache_requests_total",
+            kind=kind,
+            result="miss" if value is _MISSING else "hit",
+        )
+        metrics.set_gauge("appointment_cache_hit_ratio", round(ratio, 4), kind=kind)
+        return value
+
+    def put(self, kind: str, key: Hashable, version: int, value: Any) -> None:
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[(kind, key)] = value
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        metrics.set_gauge("appointment_cache_entries", size)
+
+
+@lru_cache(maxsize=1)
+def get_appointment_cache() -> AppointmentReadCache:
+    return AppointmentReadCache(max_entries=get_settings().appointment_cache_entries)
+
+
+# Callers read the version with `current_version` on the same session first, so
+# it comes from the same transaction (snapshot) as the rows it tags.
+
+
+async def list_appointments_page_cached(
+    query: AppointmentQuery,
+    session: AsyncSession,
+    version: Optional[int],
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Cached `list_appointments_page_async`, keyed by cursor, filters and limit.
+
+    `version` comes from `current_version` on the same session; None bypasses the cache.
+    """
+
+    cache = get_appointment_cache()
+    if version is None or not cache:
+        return await appointment_service.list_appointments_page_async(query, session)
+
+    page = cache.get("page", query, version)
+    if page is _MISSING:
+        page = await appointment_service.list_appointments_page_async(query, session)
+        cache.put("page", query, version, page)
+    return page
+
+
+async def get_legacy_row_cached(
+    appointment_id: int,
+    session: AsyncSession,
+    version: Optional[int],
+) -> Optional[Row]:
+    """Cached `get_legacy_row_async` (misses for unknown ids are cached too)."""
+
+    cache = get_appointment_cache()
+    if version is None or not cache:
+        return await appointment_service.get_legacy_row_async(appointment_id, session)
+
+    row = cache.get("row", appointment_id, version)
+    if row is _MISSING:
+        row = await appointment_service.get_legacy_row_async(appointment_id, session)
+        cache.put("row", appointment_id, version, row)
+    return row
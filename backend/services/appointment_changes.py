@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.appointment_changes import AppointmentChange
+from ..models.appointments import Appointment
+from .appointment_service import LEGACY_COLUMNS, legacy_dict
+from .table_versions import get_change_notifier
+
+DEFAULT_CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+MAX_WAIT_SECONDS = 30.0
+# Writes from other worker processes are not signalled in-process, so
+# long-polls also re-check at this interval.
+RECHECK_SECONDS = 1.0
+
+_CHANGE_COLUMNS = (AppointmentChange.seq, AppointmentChange.op, AppointmentChange.appointment_id)
+
+
+def parse_since(cursor: str) -> int:
+    """Feed cursor -> last seen sequence number; raises ValueError if malformed."""
+
+    try:
+        since = int(cursor)
+    except ValueError as exc:
+        raise ValueError("Invalid change feed cursor.") from exc
+    if since < 0:
+        raise ValueError("Invalid change feed cursor.")
+    return since
+
+
+def _change_dict(row: Sequence[Any]) -> Dict[str, Any]:
+    seq, op, appointment_id, *values = row
+    return {
+        "seq": seq,
+        "op": op,
+        "appointment_id": str(appointment_id),
+        # Current state of the row; null once it has been deleted.
+        "appointment": legacy_dict(values) if values[0] is not None else None,
+    }
+
+
+async def list_changes_async(
+    session: AsyncSession,
+    since: int,
+    limit: int = DEFAULT_CHANGES_LIMIT,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Changes after `since` in commit order, plus the cursor to resume from."""
+
+    statement = (
+        select(*_CHANGE_COLUMNS, *LEGACY_COLUMNS)
+        .outerjoin(Appointment, Appointment.id == AppointmentChange.appointment_id)
+        .where(AppointmentChange.seq > since)
+        .order_by(AppointmentChange.seq)
+        .limit(limit)
+    )
+    changes = [_change_dict(row) for row in (await session.execute(statement)).all()]
+    next_cursor = str(changes[-1]["seq"]) if changes else str(since)
+    return changes, next_cursor
+
+
+async def wait_for_changes(
+    session: AsyncSession,
+    since: int,
+    limit: int = DEFAULT_CHANGES_LIMIT,
+    wait: float = 0.0,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Long-poll variant of `list_changes_async`.
+
+    Returns as soon as there is at least one change, or with an empty list
+    once `wait` seconds have passed.
+    """
+
+    notifier = get_change_notifier()
+    deadline = time.monotonic() + min(wait, MAX_WAIT_SECONDS)
+    while True:
+        event = notifier.current()
+        changes, next_cursor = await list_changes_async(session, since, limit)
+        remaining = deadline - time.monotonic()
+        if changes or remaining <= 0:
+            return changes, next_cursor
+        # End the read transaction so the next query sees a fresh snapshot.
+        await session.rollback()
+        try:
+            await asyncio.wait_for(event.wait(), timeout=min(remaining, RECHECK_SECONDS))
+        except asyncio.TimeoutError:
+            pass
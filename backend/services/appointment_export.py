@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Sequence, Tuple
+
+import orjson
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..db import async_read_engine
+from ..models.appointments import Appointment
+from .appointment_service import (
+    LEGACY_COLUMNS,
+    LEGACY_KEYS,
+    AppointmentQuery,
+    apply_filters,
+    legacy_dict,
+)
+
+# Rows fetched from the server-side cursor per round trip.
+EXPORT_BATCH_SIZE = 1000
+
+# CSV needs fixed columns, so extra fields stay together as one JSON cell.
+EXPORT_HEADERS = list(LEGACY_KEYS) + ["attributes"]
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return orjson.dumps(value).decode("utf-8")
+    return value
+
+
+def _csv_values(row: Sequence[Any]) -> List[Any]:
+    return [_cell(value) for value in row]
+
+
+def _ndjson(rows: List[Sequence[Any]]) -> bytes:
+    return b"".join(orjson.dumps(legacy_dict(row)) + b"\n" for row in rows)
+
+
+class _CSVEncoder:
+    def __init__(self) -> None:
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def header(self) -> str:
+        return self._flush([EXPORT_HEADERS])
+
+    def __call__(self, rows: List[Sequence[Any]]) -> str:
+        return self._flush(_csv_values(row) for row in rows)
+
+    def _flush(self, rows) -> str:
+        self.writer.writerows(rows)
+        chunk = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return chunk
+
+
+# format -> (media type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+
+async def export_appointments(
+    query: AppointmentQuery,
+    export_format: str,
+) -> AsyncIterator[str | bytes]:
+    """
+    Yield every matching appointment, oldest first, encoded as NDJSON or CSV.
+
+    Rows come straight off a server-side cursor in batches of
+    `EXPORT_BATCH_SIZE` and are encoded from column tuples, so memory stays
+    flat however many leads are exported. The session is opened here rather
+    than by a dependency so it lives exactly as long as the response stream.
+    """
+
+    encode: Callable[[List[Sequence[Any]]], str | bytes]
+    if export_format == "csv":
+        encoder = _CSVEncoder()
+        yield encoder.header()
+        encode = encoder
+    else:
+        encode = _ndjson
+
+    statement = (
+        apply_filters(select(*LEGACY_COLUMNS), query)
+        .order_by(Appointment.created_at, Appointment.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async with AsyncSession(async_read_engine) as session:
+        result = await session.stream(statement)
+        async for partition in result.partitions():
+            yield encode(partition)
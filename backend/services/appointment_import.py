@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import codecs
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+
+from ..db import async_engine, engine
+from ..models.appointments import Appointment, LegacyAppointmentCreate
+from .appointment_service import _coerce_create_payload
+from .table_versions import get_change_notifier, record_appointment_write
+
+DEFAULT_BATCH_SIZE = 1000
+# Keep error reports bounded for very dirty inputs; the count stays exact.
+MAX_REPORTED_ERRORS = 1000
+
+_WHITESPACE = " \t\r\n"
+
+
+class RecordParser:
+    """
+    Incrementally parse a JSON array of objects or NDJSON from arbitrary chunks.
+
+    Only complete top-level values are decoded, so memory is bounded by the
+    largest single record rather than the whole payload. NDJSON lines that
+    fail to decode are reported and skipped; a malformed JSON array cannot be
+    resynchronized and ends parsing.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._mode: Optional[str] = None  # "array" or "lines"
+        self._done = False
+        self._line = 0
+
+    def feed(self, chunk: bytes | str) -> List[Tuple[int, Any, Optional[str]]]:
+        """Return (row number, value, error) for every record completed by `chunk`."""
+
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk)
+        self._buffer += chunk
+        return self._drain(final=False)
+
+    def close(self) -> List[Tuple[int, Any, Optional[str]]]:
+        self._buffer += self._utf8.decode(b"", final=True)
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> List[Tuple[int, Any, Optional[str]]]:
+        if self._mode is None:
+            stripped = self._buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            self._mode = "array" if stripped[0] == "[" else "lines"
+            self._buffer = stripped[1:] if self._mode == "array" else stripped
+        if self._mode == "array":
+            return self._drain_array(final)
+        return self._drain_lines(final)
+
+    def _drain_lines(self, final: bool) -> List[Tuple[int, Any, Optional[str]]]:
+        records = []
+        *lines, self._buffer = self._buffer.split("\n")
+        if final:
+            lines.append(self._buffer)
+            self._buffer = ""
+        for line in lines:
+            if not line.strip():
+                continue
+            self._line += 1
+            try:
+                records.append((self._line, json.loads(line), None))
+            except json.JSONDecodeError as exc:
+                records.append((self._line, None, f"Invalid JSON: {exc.msg}"))
+        return records
+
+    def _drain_array(self, final: bool) -> List[Tuple[int, Any, Optional[str]]]:
+        records = []
+        position = 0
+        buffer = self._buffer
+        while not self._done:
+            while position < len(buffer) and buffer[position] in _WHITESPACE + ",":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                self._done = True
+                position += 1
+                break
+            try:
+                value, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                if final:
+                    self._line += 1
+                    records.append((self._line, None, f"Invalid JSON: {exc.msg}"))
+                    self._done = True
+                # Otherwise the record is probably incomplete; wait for more input.
+                break
+            self._line += 1
+            records.append((self._line, value, None))
+        self._buffer = buffer[position:]
+        if final and not self._done:
+            self._line += 1
+            records.append((self._line, None, "Unterminated JSON array."))
+        return records
+
+
+def _parse_created_at(value: Any) -> datetime:
+    """Legacy `createdAt` (ISO 8601, possibly with "Z") as naive UTC, else now."""
+
+    if isinstance(value, str) and value:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    return datetime.utcnow()
+
+
+def prepare_row(record: Any) -> Dict[str, Any]:
+    """Map one legacy camelCase record to an `appointments` row (raises ValueError)."""
+
+    if not isinstance(record, dict):
+        raise ValueError("Record must be a JSON object.")
+    payload = LegacyAppointmentCreate.model_validate(record)
+    row = _coerce_create_payload(payload).model_dump()
+    row["created_at"] = _parse_created_at(record.get("createdAt"))
+    return row
+
+
+def insert_rows(connection: Connection, rows: List[Dict[str, Any]]) -> None:
+    """Insert prepared rows with a single executemany and log them in the change feed."""
+
+    table = Appointment.__table__
+    result = connection.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+    )
+    record_appointment_write(connection, [row_id for (row_id,) in result.all()], "create")
+
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def error(self, row: int | str, message: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+class _Batcher:
+    """Validate parsed records and group the good ones into insert batches."""
+
+    def __init__(self, report: ImportReport, batch_size: int) -> None:
+        self.report = report
+        self.batch_size = batch_size
+        self.rows: List[Dict[str, Any]] = []
+        self.first_row = 0
+
+    def add(
+        self,
+        records: Iterable[Tuple[int, Any, Optional[str]]],
+    ) -> Iterator[List[Dict[str, Any]]]:
+        for number, value, parse_error in records:
+            self.report.received += 1
+            if parse_error is None:
+                try:
+                    row = prepare_row(value)
+                except (ValidationError, ValueError) as exc:
+                    parse_error = _describe(exc)
+            if parse_error is not None:
+                self.report.failed += 1
+                self.report.error(number, parse_error)
+                continue
+            if not self.rows:
+                self.first_row = number
+            self.rows.append(row)
+            if len(self.rows) >= self.batch_size:
+                yield self.take()
+
+    def take(self) -> List[Dict[str, Any]]:
+        rows, self.rows = self.rows, []
+        return rows
+
+    def committed(self, rows: List[Dict[str, Any]]) -> None:
+        self.report.inserted += len(rows)
+
+    def rejected(self, rows: List[Dict[str, Any]], exc: Exception) -> None:
+        self.report.failed += len(rows)
+        self.report.error(f"batch starting at row {self.first_row}", str(exc.__cause__ or exc))
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
+
+
+async def import_stream(
+    chunks: AsyncIterator[bytes],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """Import records from a byte stream (e.g. a request body) through the writer engine."""
+
+    report = ImportReport()
+    parser = RecordParser()
+    batcher = _Batcher(report, batch_size)
+
+    async def flush(rows: List[Dict[str, Any]]) -> None:
+        try:
+            async with async_engine.begin() as connection:
+                await connection.run_sync(insert_rows, rows)
+        except Exception as exc:
+            batcher.rejected(rows, exc)
+        else:
+            batcher.committed(rows)
+            get_change_notifier().notify()
+
+    async for chunk in chunks:
+        for rows in batcher.add(parser.feed(chunk)):
+            await flush(rows)
+    for rows in batcher.add(parser.close()):
+        await flush(rows)
+    if batcher.rows:
+        await flush(batcher.take())
+    return report
+
+
+def import_stream_sync(
+    chunks: Iterable[bytes | str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """Synchronous counterpart of `import_stream` for the CLI."""
+
+    report = ImportReport()
+    parser = RecordParser()
+    batcher = _Batcher(report, batch_size)
+
+    def flush(rows: List[Dict[str, Any]]) -> None:
+        try:
+            with engine.begin() as connection:
+                insert_rows(connection, rows)
+        except Exception as exc:
+            batcher.rejected(rows, exc)
+        else:
+            batcher.committed(rows)
+
+    for chunk in chunks:
+        for rows in batcher.add(parser.feed(chunk)):
+            flush(rows)
+    for rows in batcher.add(parser.close()):
+        flush(rows)
+    if batcher.rows:
+        flush(batcher.take())
+    return report
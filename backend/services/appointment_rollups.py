@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.appointment_rollups import AppointmentRollup
+from ..models.appointments import Appointment
+
+STATS_DIMENSIONS = ("location", "service_type", "day", "hour")
+# Bound on ids per aggregation query (SQLite caps bound parameters).
+_IDS_PER_QUERY = 1000
+
+Executor = Union[Connection, Session]
+
+
+def _dialect_name(executor: Executor) -> str:
+    bind = executor if isinstance(executor, Connection) else executor.get_bind()
+    return bind.dialect.name
+
+
+def _hour_bucket(dialect: str):
+    if dialect == "postgresql":
+        return func.date_trunc("hour", Appointment.created_at)
+    return func.strftime("%Y-%m-%d %H:00:00", Appointment.created_at)
+
+
+def _as_datetime(value: Union[str, datetime]) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _aggregate(executor: Executor, where: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """Count appointments per rollup bucket with one GROUP BY; at most one row per bucket."""
+
+    bucket = _hour_bucket(_dialect_name(executor))
+    location = func.coalesce(Appointment.location, "")
+    service_type = func.coalesce(Appointment.service_type, "")
+    statement = select(bucket, location, service_type, func.count()).group_by(
+        bucket, location, service_type
+    )
+    if where is not None:
+        statement = statement.where(where)
+    return [
+        {
+            "bucket_hour": _as_datetime(hour),
+            "location": location_value,
+            "service_type": service_value,
+            "leads": leads,
+        }
+        for hour, location_value, service_value, leads in executor.execute(statement)
+    ]
+
+
+def add_to_rollups(executor: Executor, appointment_ids: Sequence[int]) -> None:
+    """
+    Count newly inserted appointments into their rollup buckets.
+
+    Call it in the inserting transaction (via `record_appointment_write`).
+    Buckets are computed by the database from the stored rows, so writes and
+    `rebuild_rollups` always agree on bucket boundaries.
+    """
+
+    dialect = _dialect_name(executor)
+    upsert = (postgresql_insert if dialect == "postgresql" else sqlite_insert)(AppointmentRollup)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["bucket_hour", "location", "service_type"],
+        set_={"leads": AppointmentRollup.leads + upsert.excluded.leads},
+    )
+    for start in range(0, len(appointment_ids), _IDS_PER_QUERY):
+        chunk = appointment_ids[start : start + _IDS_PER_QUERY]
+        increments = _aggregate(executor, Appointment.id.in_(chunk))
+        if increments:
+            executor.execute(upsert, increments)
+
+
+def rebuild_rollups(executor: Executor) -> int:
+    """Recompute every rollup bucket from `appointments`; return the number of buckets."""
+
+    executor.execute(delete(AppointmentRollup))
+    buckets = _aggregate(executor)
+    if buckets:
+        executor.execute(AppointmentRollup.__table__.insert(), buckets)
+    return len(buckets)
+
+
+def _dimension_values(row: Sequence[Any], group_by: Iterable[str]) -> Tuple[Any, ...]:
+    bucket_hour, location, service_type = row[0], row[1], row[2]
+    values = {
+        "location": location or None,
+        "service_type": service_type or None,
+        "day": bucket_hour.date(),
+        "hour": bucket_hour.hour,
+    }
+    return tuple(values[dimension] for dimension in group_by)
+
+
+def _sort_key(key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    # None (unknown location/service type) sorts first.
+    return tuple((value is not None, value) for value in key)
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+async def appointment_stats_async(
+    session: AsyncSession,
+    group_by: Sequence[str] = (),
+    location: Optional[str] = None,
+    service_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Lead counts grouped by any of `STATS_DIMENSIONS`, read from the rollups only.
+
+    Cost grows with the number of hourly buckets in range, not with the
+    number of appointments. Times are UTC; `day` is the calendar date and
+    `hour` the hour of day (0-23). `created_after` (inclusive) and
+    `created_before` (exclusive) must be whole hours, so the counts match
+    the same range on `GET /appointments`.
+    """
+
+    statement = select(
+        AppointmentRollup.bucket_hour,
+        AppointmentRollup.location,
+        AppointmentRollup.service_type,
+        AppointmentRollup.leads,
+    )
+    if location is not None:
+        statement = statement.where(AppointmentRollup.location == location)
+    if service_type is not None:
+        statement = statement.where(AppointmentRollup.service_type == service_type)
+    if created_after is not None:
+        statement = statement.where(AppointmentRollup.bucket_hour >= created_after)
+    if created_before is not None:
+        statement = statement.where(AppointmentRollup.bucket_hour < created_before)
+
+    counts: Dict[Tuple[Any, ...], int] = defaultdict(int)
+    total = 0
+    for row in await session.execute(statement):
+        counts[_dimension_values(row, group_by)] += row[3]
+        total += row[3]
+    buckets = [
+        {
+            **{dimension: _json_value(value) for dimension, value in zip(group_by, key)},
+            "count": count,
+        }
+        for key, count in sorted(counts.items(), key=lambda item: _sort_key(item[0]))
+    ]
+    return {"total": total, "group_by": list(group_by), "buckets": buckets}
@@ -1,15 +1,105 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import Row, String, and_, literal_column, or_, update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.appointments import (
     Appointment,
     AppointmentCreate,
     LegacyAppointmentCreate,
-    LegacyAppointmentResponse,
 )
+from .appointment_broadcast import get_appointment_broadcaster
+from .table_versions import get_change_notifier, record_appointment_write
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass(frozen=True)
+class AppointmentQuery:
+    """One page of appointments, newest first, after an optional keyset cursor."""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+    location: Optional[str] = None
+    service_type: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    status: Optional[str] = None
+    utm_source: Optional[str] = None
+
+
+# Generated from `attributes` and indexed by migration 5; not mapped on the model.
+UTM_SOURCE = literal_column("appointments.utm_source", String)
+
+# Allowed lifecycle moves: current status -> statuses it may change to.
+STATUS_TRANSITIONS: Dict[str, Tuple[str, ...]] = {
+    "new": ("contacted", "cancelled"),
+    "contacted": ("confirmed", "cancelled", "no_show"),
+    "confirmed": ("cancelled", "no_show"),
+}
+CLOSED_STATUSES = ("confirmed", "cancelled", "no_show")
+
+
+def encode_cursor(created_at: datetime, appointment_id: int) -> str:
+    """Opaque cursor pointing just past this row in (created_at, id) order."""
+
+    raw = f"{created_at.isoformat()}|{appointment_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of `encode_cursor`; raises ValueError for malformed cursors."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, _, appointment_id = (
+            base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").partition("|")
+        )
+        return datetime.fromisoformat(created_at), int(appointment_id)
+    except (UnicodeError, ValueError, TypeError) as exc:
+        raise ValueError("Invalid pagination cursor.") from exc
+
+
+def apply_filters(statement, query: AppointmentQuery):
+    """Restrict `statement` to the location/service type/creation window in `query`."""
+
+    if query.location is not None:
+        statement = statement.where(Appointment.location == query.location)
+    if query.service_type is not None:
+        statement = statement.where(Appointment.service_type == query.service_type)
+    if query.created_after is not None:
+        statement = statement.where(Appointment.created_at >= query.created_after)
+    if query.created_before is not None:
+        statement = statement.where(Appointment.created_at < query.created_before)
+    if query.status is not None:
+        statement = statement.where(Appointment.status == query.status)
+    if query.utm_source is not None:
+        statement = statement.where(UTM_SOURCE == query.utm_source)
+    return statement
+
+
+def _page_statement(query: AppointmentQuery):
+    statement = apply_filters(select(*LEGACY_COLUMNS), query)
+    if query.cursor:
+        created_at, appointment_id = decode_cursor(query.cursor)
+        statement = statement.where(
+            or_(
+                Appointment.created_at < created_at,
+                and_(Appointment.created_at == created_at, Appointment.id < appointment_id),
+            )
+        )
+    # One extra row tells us whether another page exists.
+    return statement.order_by(Appointment.created_at.desc(), Appointment.id.desc()).limit(
+        query.limit + 1
+    )
 
 
 def _coerce_create_payload(payload: LegacyAppointmentCreate) -> AppointmentCreate:
@@ -27,9 +117,19 @@ def _coerce_create_payload(payload: LegacyAppointmentCreate) -> AppointmentCreat
         vehicle_model=payload.vehicleModel,
         vehicle_year=payload.vehicleYear,
         notes=payload.notes,
+        attributes=extra_attributes(payload),
     )
 
 
+def extra_attributes(payload: LegacyAppointmentCreate) -> Optional[Dict[str, Any]]:
+    """Unknown payload fields, minus anything that would shadow a response field."""
+
+    extras = {
+        key: value for key, value in (payload.model_extra or {}).items() if key not in LEGACY_KEYS
+    }
+    return extras or None
+
+
 def create_appointment(
     payload: LegacyAppointmentCreate,
     session: Session,
@@ -39,6 +139,8 @@ def create_appointment(
     to_store = _coerce_create_payload(payload).model_dump()
     appointment = Appointment(**to_store)
     session.add(appointment)
+    session.flush()
+    record_appointment_write(session, [appointment.id], "create")
     session.commit()
     session.refresh(appointment)
     return appointment
@@ -57,25 +159,218 @@ def list_appointments(session: Session) -> List[Appointment]:
     return list(session.exec(statement))
 
 
-def to_legacy_response(appointment: Appointment) -> LegacyAppointmentResponse:
-    """Convert a database row into the legacy response structure."""
-
-    return LegacyAppointmentResponse(
-        id=str(appointment.id),
-        createdAt=appointment.created_at,
-        name=appointment.name,
-        location=appointment.location,
-        serviceType=appointment.service_type,
-        preferredDate=appointment.preferred_date,
-        preferredTime=appointment.preferred_time,
-        phone=appointment.phone,
-        email=appointment.email,
-        vehicleMake=appointment.vehicle_make,
-        vehicleModel=appointment.vehicle_model,
-        vehicleYear=appointment.vehicle_year,
-        notes=appointment.notes,
+async def create_appointment_async(
+    payload: LegacyAppointmentCreate,
+    session: AsyncSession,
+) -> Appointment:
+    """Async variant of `create_appointment`."""
+
+    to_store = _coerce_create_payload(payload).model_dump()
+    appointment = Appointment(**to_store)
+    session.add(appointment)
+    await session.flush()
+    await session.run_sync(record_appointment_write, [appointment.id], "create")
+    await session.commit()
+    get_change_notifier().notify()
+    publish_created(appointment)
+    # No refresh: the id comes back from the INSERT, created_at is set client-side
+    # and write sessions do not expire objects on commit.
+    return appointment
+
+
+def publish_created(appointment: Appointment) -> None:
+    """Push a committed appointment to live stream subscribers (event loop only)."""
+
+    get_appointment_broadcaster().publish(
+        appointment.location, legacy_dict(legacy_values(appointment))
+    )
+
+
+async def get_appointment_by_id_async(
+    appointment_id: int,
+    session: AsyncSession,
+) -> Optional[Appointment]:
+    """Async variant of `get_appointment_by_id`."""
+
+    return await session.get(Appointment, appointment_id)
+
+
+async def list_appointments_page_async(
+    query: AppointmentQuery,
+    session: AsyncSession,
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Return one keyset page as `LEGACY_COLUMNS` tuples, plus the next page's cursor (if any).
+
+    Rows are plain column tuples for `legacy_dict`; no ORM objects are built.
+    """
+
+    rows = list((await session.execute(_page_statement(query))).all())
+    if len(rows) <= query.limit:
+        return rows, None
+    rows = rows[: query.limit]
+    last = rows[-1]
+    return rows, encode_cursor(last[_CREATED_AT], last[_ID])
+
+
+async def get_legacy_row_async(appointment_id: int, session: AsyncSession) -> Optional[Row]:
+    """Fetch one appointment as a `LEGACY_COLUMNS` tuple."""
+
+    statement = select(*LEGACY_COLUMNS).where(Appointment.id == appointment_id)
+    return (await session.execute(statement)).first()
+
+
+async def update_status_async(
+    appointment_id: int,
+    status: str,
+    session: AsyncSession,
+) -> Optional[Row]:
+    """
+    Move an appointment to `status` and return it as a `LEGACY_COLUMNS` tuple.
+
+    The transition is checked in the UPDATE's WHERE clause, so concurrent
+    updates cannot both move the same lead. Returns None for unknown ids and
+    raises ValueError when the current status does not allow the move.
+    Setting the current status again is a no-op.
+    """
+
+    sources = [source for source, targets in STATUS_TRANSITIONS.items() if status in targets]
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {"status": status, "status_changed_at": now}
+    if status == "contacted":
+        values["contacted_at"] = now
+    elif status in CLOSED_STATUSES:
+        values["closed_at"] = now
+    statement = (
+        update(Appointment)
+        .where(Appointment.id == appointment_id, Appointment.status.in_(sources))
+        .values(**values)
+        .returning(*LEGACY_COLUMNS)
+        .execution_options(synchronize_session=False)
     )
+    row = (await session.execute(statement)).first()
+    if row is None:
+        await session.rollback()
+        current = await get_legacy_row_async(appointment_id, session)
+        if current is None or current[_STATUS] == status:
+            return current
+        raise ValueError(f"Cannot change status from {current[_STATUS]} to {status}.")
+    await session.run_sync(record_appointment_write, [appointment_id], "update")
+    await session.commit()
+    get_change_notifier().notify()
+    return row
+
+
+def _claimable(now: datetime, claim_ttl: float):
+    return and_(
+        Appointment.status == "new",
+        or_(
+            Appointment.claimed_at.is_(None),
+            Appointment.claimed_at < now - timedelta(seconds=claim_ttl),
+        ),
+    )
+
+
+def claim_candidate(location: Optional[str], now: datetime, claim_ttl: float):
+    """The oldest claimable lead's id (the work-queue scan `claim_next_async` runs)."""
 
+    candidate = select(Appointment.id).where(_claimable(now, claim_ttl))
+    if location is not None:
+        candidate = candidate.where(Appointment.location == location)
+    return candidate.order_by(Appointment.created_at, Appointment.id).limit(1)
+
+
+async def claim_next_async(
+    staff: str,
+    location: Optional[str],
+    claim_ttl: float,
+    session: AsyncSession,
+) -> Optional[Row]:
+    """
+    Atomically claim the oldest uncontacted lead (optionally in `location`) for `staff`.
+
+    A claim is a lease: if the lead is still `new` after `claim_ttl` seconds
+    it can be claimed again. The candidate is picked and claimed by a single
+    UPDATE, so concurrent staff never get the same lead (PostgreSQL skips
+    rows locked by other claims; SQLite serializes writers). The scan
+    (`claim_candidate`) walks the partial `status = 'new'` indexes only.
+    Returns None when nothing is waiting.
+    """
+
+    now = datetime.utcnow()
+    available = _claimable(now, claim_ttl)
+    candidate = claim_candidate(location, now, claim_ttl).with_for_update(skip_locked=True)
+    statement = (
+        update(Appointment)
+        .where(Appointment.id == candidate.scalar_subquery(), available)
+        .values(claimed_by=staff, claimed_at=now)
+        .returning(*LEGACY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    row = (await session.execute(statement)).first()
+    if row is None:
+        await session.rollback()
+        return None
+    await session.run_sync(record_appointment_write, [row[_ID]], "update")
+    await session.commit()
+    get_change_notifier().notify()
+    return row
+
+
+# Legacy (camelCase) response field -> table column, in response order.
+LEGACY_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("id", "id"),
+    ("createdAt", "created_at"),
+    ("name", "name"),
+    ("location", "location"),
+    ("serviceType", "service_type"),
+    ("preferredDate", "preferred_date"),
+    ("preferredTime", "preferred_time"),
+    ("phone", "phone"),
+    ("email", "email"),
+    ("vehicleMake", "vehicle_make"),
+    ("vehicleModel", "vehicle_model"),
+    ("vehicleYear", "vehicle_year"),
+    ("notes", "notes"),
+    ("status", "status"),
+    ("statusChangedAt", "status_changed_at"),
+    ("contactedAt", "contacted_at"),
+    ("closedAt", "closed_at"),
+    ("claimedBy", "claimed_by"),
+    ("claimedAt", "claimed_at"),
+)
+LEGACY_KEYS: Tuple[str, ...] = tuple(legacy for legacy, _column in LEGACY_FIELDS)
+# `attributes` rides along last; its keys are merged into the response.
+LEGACY_COLUMNS = tuple(getattr(Appointment, column) for _legacy, column in LEGACY_FIELDS) + (
+    Appointment.attributes,
+)
+_ID = LEGACY_KEYS.index("id")
+_CREATED_AT = LEGACY_KEYS.index("createdAt")
+_STATUS = LEGACY_KEYS.index("status")
+_ATTRIBUTES = len(LEGACY_KEYS)
+
+
+def legacy_dict(row: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Legacy response mapping for a `LEGACY_COLUMNS` tuple.
+
+    Fast path for trusted database output: no pydantic model is built or
+    validated, and the result is ready for `ORJSONResponse`.
+    """
+
+    item = dict(zip(LEGACY_KEYS, row))
+    item["id"] = str(item["id"])
+    attributes = row[_ATTRIBUTES]
+    if attributes:
+        for key, value in attributes.items():
+            item.setdefault(key, value)
+    return item
+
+
+def legacy_values(appointment: Appointment) -> Tuple[Any, ...]:
+    """An ORM row as a `LEGACY_COLUMNS` tuple."""
+
+    return tuple(getattr(appointment, column) for _legacy, column in LEGACY_FIELDS) + (
+        appointment.attributes,
+    )
 
-def to_legacy_list(appointments: List[Appointment]) -> List[LegacyAppointmentResponse]:
-    return [to_legacy_response(item) for item in appointments]
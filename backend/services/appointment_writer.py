@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from ..config import get_settings
+from ..db import async_engine
+from ..metrics import metrics
+from ..models.appointments import Appointment, LegacyAppointmentCreate
+from .appointment_service import _coerce_create_payload, publish_created
+from .table_versions import get_change_notifier, record_appointment_write
+
+logger = logging.getLogger(__name__)
+
+_TABLE = Appointment.__table__
+_INSERT = insert(_TABLE).returning(_TABLE.c.id, sort_by_parameter_order=True)
+
+_Pending = Tuple[Dict[str, Any], "asyncio.Future[Appointment]"]
+
+
+class GroupCommitWriter:
+    """
+    Write-behind queue that commits appointment creates in groups.
+
+    Callers enqueue a row and await a future. One writer task collects rows
+    for up to `max_delay` seconds (or `max_batch` rows), inserts them with a
+    single executemany `INSERT ... RETURNING id` in one transaction, and
+    resolves each future with its stored row. Callers only return after
+    their batch has committed, so durability stays per request while one
+    fsync is shared by the whole group. If a batch fails, its rows are
+    retried one by one so a single bad row only fails its own caller.
+    """
+
+    def __init__(self, max_batch: int = 256, max_delay: float = 0.005, max_queue: int = 10000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # `None` is the shutdown sentinel.
+        self._queue: "asyncio.Queue[Optional[_Pending]]" = asyncio.Queue(maxsize=max_queue)
+        self._writer: Optional[asyncio.Task] = None
+
+    async def create(self, payload: LegacyAppointmentCreate) -> Appointment:
+        if self._writer is None:
+            raise RuntimeError("The appointment group-commit writer is not running.")
+        row = _coerce_create_payload(payload).model_dump()
+        row["created_at"] = datetime.utcnow()
+        future: "asyncio.Future[Appointment]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        # Shielded: a caller that goes away must not abort the batch; the lead is still stored.
+        return await asyncio.shield(future)
+
+    async def _collect(self) -> Tuple[List[_Pending], bool]:
+        batch: List[_Pending] = []
+        first = await self._queue.get()
+        if first is None:
+            return batch, True
+        batch.append(first)
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                pending = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+        return batch, False
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> List[int]:
+        async with async_engine.begin() as connection:
+            result = await connection.execute(_INSERT, rows)
+            ids = [row_id for (row_id,) in result.all()]
+            await connection.run_sync(record_appointment_write, ids, "create")
+            return ids
+
+    @staticmethod
+    def _resolve(pending: _Pending, row_id: int) -> None:
+        row, future = pending
+        appointment = Appointment(id=row_id, **row)
+        publish_created(appointment)
+        if not future.done():
+            future.set_result(appointment)
+
+    async def _commit(self, batch: List[_Pending]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._write(batch)
+        finally:
+            get_change_notifier().notify()
+        metrics.observe("appointment_group_commit_size", len(batch))
+        metrics.observe("appointment_group_commit_seconds", time.perf_counter() - started)
+
+    async def _write(self, batch: List[_Pending]) -> None:
+        try:
+            ids = await self._insert([row for row, _future in batch])
+        except Exception:
+            logger.exception("Group commit of %d appointments failed; retrying singly", len(batch))
+            for pending in batch:
+                row, future = pending
+                try:
+                    (row_id,) = await self._insert([row])
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    self._resolve(pending, row_id)
+            return
+        for pending, row_id in zip(batch, ids):
+            self._resolve(pending, row_id)
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect()
+            if batch:
+                await self._commit(batch)
+
+    async def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit everything already queued, then stop the writer."""
+
+        if self._writer is None:
+            return
+        await self._queue.put(None)
+        await self._writer
+        self._writer = None
+
+
+@lru_cache(maxsize=1)
+def get_appointment_writer() -> GroupCommitWriter:
+    settings = get_settings()
+    return GroupCommitWriter(
+        max_batch=settings.appointment_group_commit_max,
+        max_delay=settings.appointment_group_commit_ms / 1000,
+    )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Union
+
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.appointment_changes import AppointmentChange
+from ..models.table_versions import TableVersion
+from .appointment_rollups import add_to_rollups
+
+APPOINTMENTS = "appointments"
+# Key for the `pg_advisory_xact_lock` that orders change-log writers.
+CHANGE_LOG_LOCK_KEY = 0x6170706C
+
+
+def bump_statement(name: str = APPOINTMENTS) -> Update:
+    """
+    UPDATE that advances `name`'s version.
+
+    Execute it inside the transaction that performs the write, so readers in
+    any worker process see the new version exactly when the new rows commit.
+    """
+
+    return (
+        update(TableVersion)
+        .where(TableVersion.name == name)
+        .values(version=TableVersion.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+async def current_version(
+    session: AsyncSession,
+    name: str = APPOINTMENTS,
+) -> Optional[Tuple[int, datetime]]:
+    """Return (version, updated_at) for `name`, or None if it is not tracked."""
+
+    statement = select(TableVersion.version, TableVersion.updated_at).where(
+        TableVersion.name == name
+    )
+    row = (await session.execute(statement)).first()
+    return (row[0], row[1]) if row is not None else None
+
+
+def record_appointment_write(
+    executor: Union[Connection, Session],
+    appointment_ids: Iterable[int],
+    op: str,
+) -> None:
+    """
+    Log `op` for each appointment in the change feed, count creates into the
+    rollups and bump the table version.
+
+    Call it inside the write's transaction; async code goes through
+    `AsyncSession.run_sync` / `AsyncConnection.run_sync`.
+
+    On PostgreSQL a `SERIAL` seq is handed out at insert time, not at commit,
+    so writers take a transaction-scoped advisory lock first: seqs then commit
+    in order and a feed consumer never moves past one that commits later.
+    SQLite already has a single writer.
+    """
+
+    bind = executor if isinstance(executor, Connection) else executor.get_bind()
+    if bind.dialect.name == "postgresql":
+        executor.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY})
+
+    appointment_ids = list(appointment_ids)
+    now = datetime.utcnow()
+    rows = [
+        {"appointment_id": appointment_id, "op": op, "changed_at": now}
+        for appointment_id in appointment_ids
+    ]
+    if rows:
+        executor.execute(insert(AppointmentChange), rows)
+    if op == "create":
+        add_to_rollups(executor, appointment_ids)
+    executor.execute(bump_statement())
+
+
+class ChangeNotifier:
+    """
+    Wake in-process waiters after appointment writes commit.
+
+    Waiters take `current()` before reading and wait on it afterwards, so a
+    write committed in between is never missed. Writes from other worker
+    processes are not signalled; waiters also re-check on a timeout.
+    """
+
+    def __init__(self) -> None:
+        self._event = asyncio.Event()
+
+    def current(self) -> asyncio.Event:
+        return self._event
+
+    def notify(self) -> None:
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+
+@lru_cache(maxsize=1)
+def get_change_notifier() -> ChangeNotifier:
+    return ChangeNotifier()
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import get_settings
+from ..db import async_engine, async_read_engine
+from ..metrics import metrics
+from ..models.tts_usage import TTSUsage
+
+logger = logging.getLogger(__name__)
+
+BUDGET_WINDOW = timedelta(hours=24)
+
+
+def client_id_for(request: Request) -> str:
+    """
+    Identify the caller for per-client budgets.
+
+    Budgets key on the peer address. `X-Client-Id` is client-controlled, so it
+    is only honoured when the peer is one of `TTS_TRUSTED_PROXIES` (a proxy or
+    auth layer that sets it itself).
+    """
+
+    peer = request.client.host if request.client else "unknown"
+    if peer in get_settings().tts_trusted_proxies:
+        explicit = request.headers.get("x-client-id")
+        if explicit:
+            return explicit[:64]
+    return peer
+
+
+def _mask(client_id: str) -> str:
+    return f"...{client_id[-4:]}"
+
+
+class _RollingWindow:
+    """Sum of (timestamp, characters) events over the trailing budget window."""
+
+    __slots__ = ("events", "total")
+
+    def __init__(self) -> None:
+        self.events: Deque[Tuple[float, int]] = deque()
+        self.total = 0
+
+    def add(self, at: float, characters: int) -> None:
+        self.events.append((at, characters))
+        self.total += characters
+
+    def prune(self, cutoff: float) -> int:
+        while self.events and self.events[0][0] < cutoff:
+            self.total -= self.events.popleft()[1]
+        return self.total
+
+
+class UsageLedger:
+    """
+    Append-only TTS usage ledger with rolling-window character budgets.
+
+    `record()` only enqueues; a background task writes rows in batches so the
+    request path never waits on the database. Budgets are checked against
+    in-memory rolling windows, seeded from the ledger at startup. Only billable
+    usage (upstream synthesis that missed the cache) counts towards budgets;
+    requests coalesced onto another's synthesis are logged but not billed.
+    A budget of 0 disables that limit.
+    """
+
+    def __init__(
+        self,
+        daily_budget: int = 0,
+        client_daily_budget: int = 0,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+    ) -> None:
+        self.daily_budget = daily_budget
+        self.client_daily_budget = client_daily_budget
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # `None` is the shutdown sentinel.
+        self._queue: "asyncio.Queue[Optional[TTSUsage]]" = asyncio.Queue(maxsize=max_queue)
+        self._writer: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._global = _RollingWindow()
+        self._clients: Dict[str, _RollingWindow] = {}
+
+    def _count(self, client_id: str, at: float, characters: int) -> None:
+        with self._lock:
+            self._global.add(at, characters)
+            self._clients.setdefault(client_id, _RollingWindow()).add(at, characters)
+
+    def usage_for(self, client_id: str) -> Tuple[int, int]:
+        """Return (global, client) billable characters in the current window."""
+
+        cutoff = time.time() - BUDGET_WINDOW.total_seconds()
+        with self._lock:
+            total = self._global.prune(cutoff)
+            window = self._clients.get(client_id)
+            client_total = window.prune(cutoff) if window else 0
+            if window is not None and not window.events:
+                del self._clients[client_id]
+        return total, client_total
+
+    def allows(self, client_id: str, characters: int = 0) -> bool:
+        total, client_total = self.usage_for(client_id)
+        if self.daily_budget and total + characters > self.daily_budget:
+            metrics.increment("tts_budget_rejections_total", scope="global")
+            return False
+        if self.client_daily_budget and client_total + characters > self.client_daily_budget:
+            metrics.increment("tts_budget_rejections_total", scope="client")
+            return False
+        return True
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Window totals; client ids are masked like API key labels."""
+
+        cutoff = time.time() - BUDGET_WINDOW.total_seconds()
+        with self._lock:
+            total = self._global.prune(cutoff)
+            clients = sorted(
+                ((client, window.prune(cutoff)) for client, window in self._clients.items()),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+        return {
+            "window_hours": BUDGET_WINDOW.total_seconds() / 3600,
+            "billable_characters": total,
+            "daily_budget": self.daily_budget or None,
+            "client_daily_budget": self.client_daily_budget or None,
+            "top_clients": [
+                {"client_id": _mask(client), "billable_characters": used}
+                for client, used in clients[:top]
+                if used
+            ],
+        }
+
+    def record(
+        self,
+        client_id: str,
+        characters: int,
+        provider: str,
+        latency_ms: float,
+        cache_hit: bool,
+        coalesced: bool = False,
+        voice_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+        output_format: Optional[str] = None,
+    ) -> None:
+        if provider != "local" and not cache_hit and not coalesced:
+            self._count(client_id, time.time(), characters)
+        entry = TTSUsage(
+            client_id=client_id,
+            characters=characters,
+            provider=provider,
+            latency_ms=round(latency_ms, 1),
+            cache_hit=cache_hit,
+            coalesced=coalesced,
+            voice_id=voice_id,
+            model_id=model_id,
+            output_format=output_format,
+        )
+        metrics.increment(
+            "tts_characters_total",
+            characters,
+            provider=provider,
+            cache="hit" if cache_hit else "coalesced" if coalesced else "miss",
+        )
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            metrics.increment("tts_ledger_dropped_total")
+
+    async def _seed(self) -> None:
+        since = datetime.utcnow() - BUDGET_WINDOW
+        statement = select(TTSUsage.client_id, TTSUsage.created_at, TTSUsage.characters).where(
+            TTSUsage.created_at >= since,
+            TTSUsage.cache_hit == False,  # noqa: E712 - SQL expression
+            TTSUsage.coalesced == False,  # noqa: E712 - SQL expression
+            TTSUsage.provider != "local",
+        )
+        epoch = datetime(1970, 1, 1)
+        async with AsyncSession(async_read_engine) as session:
+            for client_id, created_at, characters in await session.exec(statement):
+                self._count(client_id, (created_at - epoch).total_seconds(), characters)
+
+    async def _write_batch(self, batch: List[TTSUsage]) -> None:
+        # Shares the serialized writer connection with appointment writes.
+        async with AsyncSession(async_engine) as session:
+            session.add_all(batch)
+            await session.commit()
+
+    async def _drain(self) -> Tuple[List[TTSUsage], bool]:
+        """Collect up to `batch_size` rows or whatever arrives within `flush_interval`."""
+
+        batch: List[TTSUsage] = []
+        first = await self._queue.get()
+        if first is None:
+            return batch, True
+        batch.append(first)
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._drain()
+            if not batch:
+                continue
+            try:
+                await self._write_batch(batch)
+                metrics.increment("tts_ledger_rows_written_total", len(batch))
+            except Exception:  # pragma: no cover - keep the writer alive
+                logger.exception("Failed to write %d TTS ledger rows", len(batch))
+
+    async def start(self) -> None:
+        if self._writer is not None:
+            return
+        await self._seed()
+        self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued rows and stop the writer."""
+
+        if self._writer is None:
+            return
+        await self._queue.put(None)
+        await self._writer
+        self._writer = None
+
+
+@lru_cache(maxsize=1)
+def get_usage_ledger() -> UsageLedger:
+    settings = get_settings()
+    return UsageLedger(
+        daily_budget=settings.tts_daily_character_budget,
+        client_daily_budget=settings.tts_client_daily_character_budget,
+    )
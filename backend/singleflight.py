@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .metrics import metrics
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce concurrent calls that share a key into one in-flight task.
+
+    The first caller for a key starts `factory()`; everyone arriving before it
+    finishes awaits the same result (or exception). A waiter that is cancelled,
+    e.g. because its client disconnected, only stops waiting; the shared task is
+    cancelled once no waiters remain.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[str, _Call[T]] = {}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        value, _coalesced = await self.call(key, factory)
+        return value
+
+    async def call(self, key: str, factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Like `do`, plus whether this caller joined another caller's task (coalesced)."""
+
+        call = self._calls.get(key)
+        coalesced = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+            metrics.increment("singleflight_calls_total", flight=self.name, role="leader")
+        else:
+            metrics.increment("singleflight_calls_total", flight=self.name, role="follower")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), coalesced
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Forget it now, not in the done-callback a loop iteration later,
+                # so a caller arriving in between starts a fresh task instead of
+                # joining one that is already cancelled.
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+class SharedStream:
+    """
+    Fan one async byte stream out to any number of subscribers.
+
+    A background task pumps `source` into a buffer; every subscriber gets its
+    own iterator that replays the buffer from the start and then follows live
+    chunks. The pump is cancelled (closing `source`) when the last subscriber
+    leaves before the stream has finished. Every subscriber after the first is
+    reported as coalesced.
+    """
+
+    def __init__(self, source: AsyncIterator[bytes]) -> None:
+        self._source = source
+        self._chunks: List[bytes] = []
+        self._error: Optional[BaseException] = None
+        self._finished = False
+        self._signal = asyncio.Event()
+        self._subscribers = 0
+        self._subscriptions = 0
+        self.pump = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        try:
+            async for chunk in self._source:
+                self._chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self._error = ConnectionAbortedError("Shared stream was cancelled.")
+            raise
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._finished = True
+            self._notify()
+
+    def _notify(self) -> None:
+        signal, self._signal = self._signal, asyncio.Event()
+        signal.set()
+
+    def subscribe(self) -> Tuple[AsyncIterator[bytes], bool]:
+        """A new replaying iterator, plus whether another subscriber came first."""
+
+        self._subscriptions += 1
+        return self._follow(), self._subscriptions > 1
+
+    async def _follow(self) -> AsyncIterator[bytes]:
+        # Counted once iteration starts: a generator that is never started
+        # (client gone before the body began) never runs its `finally`, so
+        # counting it earlier would keep the pump alive for nobody.
+        self._subscribers += 1
+        index = 0
+        try:
+            while True:
+                if index < len(self._chunks):
+                    index += 1
+                    yield self._chunks[index - 1]
+                    continue
+                if self._error is not None:
+                    raise self._error
+                if self._finished:
+                    return
+                await self._signal.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self.pump.done():
+                self.pump.cancel()
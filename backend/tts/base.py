@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+from .formats import OutputFormat
+from .policy import DEFAULT_PARAMS, SynthesisParams
+
+
+@dataclass(frozen=True)
+class SynthesisResult:
+    """Audio produced by a TTS provider along with how it should be served."""
+
+    audio: bytes
+    media_type: str
+    provider: str
+    params: SynthesisParams = DEFAULT_PARAMS
+    cache_hit: bool = False
+    # Shared from another request's in-flight synthesis (not billed again).
+    coalesced: bool = False
+
+
+class UpstreamError(HTTPException):
+    """A provider answered with a non-success status (kept in `upstream_status`)."""
+
+    def __init__(self, upstream_status: int) -> None:
+        super().__init__(
+            status_code=502, detail=f"Upstream TTS service failed ({upstream_status})."
+        )
+        self.upstream_status = upstream_status
+
+
+def iter_chunks(audio: bytes, chunk_size: int):
+    """Split a finished audio buffer into `chunk_size` pieces for streaming."""
+
+    for offset in range(0, len(audio), chunk_size):
+        yield audio[offset : offset + chunk_size]
+
+
+class TTSProvider(ABC):
+    """Common interface implemented by every speech backend."""
+
+    name: str = "unknown"
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Return True when the provider is configured and can be called."""
+
+    @abstractmethod
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None,
+        output_format: OutputFormat,
+        params: SynthesisParams = DEFAULT_PARAMS,
+    ) -> SynthesisResult:
+        """Render `text` to audio, honouring `output_format` and `params` where supported."""
+
+    def params_for(self, params: SynthesisParams) -> SynthesisParams:
+        """The settings this provider actually applies when asked for `params`."""
+
+        return params
+
+    def media_type_for(self, output_format: OutputFormat) -> str:
+        """Media type this provider emits when asked for `output_format`."""
+
+        return output_format.media_type
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: str | None,
+        output_format: OutputFormat,
+        params: SynthesisParams = DEFAULT_PARAMS,
+    ) -> AsyncIterator[bytes]:
+        """Yield audio incrementally; providers without streaming synthesize first."""
+
+        result = await self.synthesize(text, voice_id, output_format, params)
+        for chunk in iter_chunks(result.audio, params.chunk_size):
+            yield chunk
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .base import SynthesisResult
+
+
+def audio_cache_key(text: str, voice_id: str, *parts: object) -> str:
+    """Stable cache key for synthesized audio; `parts` carry encoding choices."""
+
+    digest = hashlib.sha256()
+    for part in (text, voice_id, *parts):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """In-memory LRU cache of synthesized audio bounded by total byte size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, SynthesisResult]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[SynthesisResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: SynthesisResult) -> None:
+        size = len(result.audio)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.audio)
+            self._entries[key] = result
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.audio)
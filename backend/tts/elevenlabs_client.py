@@ -1,51 +1,175 @@
 from __future__ import annotations
 
 import logging
+from typing import Any, AsyncIterator, Dict, Tuple
 
 import httpx
 from fastapi import HTTPException
 
 from ..config import DEFAULT_ELEVEN_VOICE_ID, get_settings
+from .base import SynthesisResult, TTSProvider, UpstreamError
+from .formats import DEFAULT_FORMAT, OutputFormat
+from .key_pool import KeyState, get_key_pool
+from .policy import DEFAULT_PARAMS, SynthesisParams
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-async def synthesize_speech(text: str, voice_id: str | None = None) -> bytes:
-    """Call the ElevenLabs TTS REST API and return MP3 bytes for the provided text."""
-
-    api_key = settings.elevenlabs_api_key
-    if not api_key:
+def _require_keys() -> None:
+    if not get_key_pool():
         raise HTTPException(
             status_code=500,
             detail="ELEVENLABS_API_KEY is not configured on the server.",
         )
 
+
+def _report_status(key: KeyState, response: httpx.Response) -> None:
+    """Take throttled or rejected keys out of rotation."""
+
+    if response.status_code == 429:
+        retry_after = response.headers.get("retry-after")
+        get_key_pool().mark_throttled(
+            key, float(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+    elif response.status_code in (401, 403):
+        get_key_pool().mark_rejected(key)
+
+
+def _build_request(
+    text: str,
+    voice_id: str | None,
+    output_format: OutputFormat,
+    synthesis_params: SynthesisParams,
+    api_key: str,
+) -> Tuple[str, Dict[str, str], Dict[str, Any], Dict[str, Any]]:
+    """Return (url, headers, query params, JSON body) for a synthesis call."""
+
     voice = voice_id or settings.elevenlabs_default_voice_id or DEFAULT_ELEVEN_VOICE_ID
     url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice}"
     payload = {
         "text": text,
-        "model_id": "eleven_multilingual_v2",
+        "model_id": synthesis_params.model_id,
         "voice_settings": {
-            "stability": 0.55,
-            "similarity_boost": 0.75,
+            "stability": synthesis_params.stability,
+            "similarity_boost": synthesis_params.similarity_boost,
         },
     }
 
     headers = {
         "xi-api-key": api_key,
         "Content-Type": "application/json",
-        "Accept": "audio/mpeg",
+        "Accept": output_format.media_type,
     }
+    params = {
+        "output_format": output_format.elevenlabs_code,
+        "optimize_streaming_latency": synthesis_params.optimize_streaming_latency,
+    }
+    return url, headers, params, payload
+
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.post(url, headers=headers, json=payload)
+async def synthesize_speech(
+    text: str,
+    voice_id: str | None = None,
+    output_format: OutputFormat = DEFAULT_FORMAT,
+    synthesis_params: SynthesisParams = DEFAULT_PARAMS,
+) -> bytes:
+    """Call the ElevenLabs TTS REST API and return audio bytes in `output_format`."""
 
-    if response.status_code != 200:
-        logger.warning(
-            "ElevenLabs TTS failed (%s): %s", response.status_code, response.text
+    _require_keys()
+    with get_key_pool().lease(len(text)) as key:
+        url, headers, params, payload = _build_request(
+            text, voice_id, output_format, synthesis_params, key.config.api_key
         )
-        raise HTTPException(status_code=502, detail="Upstream TTS service failed.")
 
-    return response.content
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(url, headers=headers, params=params, json=payload)
+
+        if response.status_code != 200:
+            _report_status(key, response)
+            logger.warning(
+                "ElevenLabs TTS failed with key %s (%s): %s",
+                key.label,
+                response.status_code,
+                response.text,
+            )
+            raise UpstreamError(response.status_code)
+
+        return response.content
+
+
+async def stream_speech(
+    text: str,
+    voice_id: str | None = None,
+    output_format: OutputFormat = DEFAULT_FORMAT,
+    synthesis_params: SynthesisParams = DEFAULT_PARAMS,
+) -> AsyncIterator[bytes]:
+    """
+    Stream audio from the ElevenLabs `/stream` endpoint as it is generated.
+
+    Closing or cancelling the iterator exits the `httpx` stream context, which
+    closes the upstream connection and stops generation mid-utterance.
+    """
+
+    _require_keys()
+    with get_key_pool().lease(len(text)) as key:
+        url, headers, params, payload = _build_request(
+            text, voice_id, output_format, synthesis_params, key.config.api_key
+        )
+
+        async with httpx.AsyncClient(timeout=30) as client:
+            async with client.stream(
+                "POST", f"{url}/stream", headers=headers, params=params, json=payload
+            ) as response:
+                if response.status_code != 200:
+                    _report_status(key, response)
+                    body = await response.aread()
+                    logger.warning(
+                        "ElevenLabs TTS stream failed with key %s (%s): %s",
+                        key.label,
+                        response.status_code,
+                        body.decode("utf-8", "replace"),
+                    )
+                    raise UpstreamError(response.status_code)
+
+                async for chunk in response.aiter_bytes(synthesis_params.chunk_size):
+                    yield chunk
+
+
+class ElevenLabsProvider(TTSProvider):
+    """Hosted ElevenLabs voices; requires `ELEVENLABS_API_KEY` or `ELEVENLABS_API_KEYS`."""
+
+    name = "elevenlabs"
+
+    def is_available(self) -> bool:
+        return bool(get_key_pool())
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None,
+        output_format: OutputFormat,
+        params: SynthesisParams = DEFAULT_PARAMS,
+    ) -> SynthesisResult:
+        audio = await synthesize_speech(
+            text=text,
+            voice_id=voice_id,
+            output_format=output_format,
+            synthesis_params=params,
+        )
+        return SynthesisResult(
+            audio=audio,
+            media_type=output_format.media_type,
+            provider=self.name,
+            params=params,
+        )
 
+    async def stream(
+        self,
+        text: str,
+        voice_id: str | None,
+        output_format: OutputFormat,
+        params: SynthesisParams = DEFAULT_PARAMS,
+    ) -> AsyncIterator[bytes]:
+        async for chunk in stream_speech(text, voice_id, output_format, params):
+            yield chunk
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from ..faq import FAQ_DATABASE
+from ..metrics import metrics
+from .formats import OutputFormat
+from .routing import TTSDispatcher, get_tts_dispatcher
+from .text_normalizer import normalize_for_speech
+
+# Parallel syntheses while building a bundle; keeps upstream bursts modest.
+BUILD_CONCURRENCY = 4
+
+
+@lru_cache(maxsize=1)
+def corpus_version() -> str:
+    """Hash of the spoken FAQ corpus; changes whenever an answer changes."""
+
+    digest = hashlib.sha256()
+    for faq in FAQ_DATABASE:
+        digest.update(faq.answer.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(_speech_text(faq.answer, faq.spoken).encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()[:16]
+
+
+def _speech_text(answer: str, spoken: str | None) -> str:
+    return normalize_for_speech(spoken or answer)
+
+
+@dataclass
+class FAQBundle:
+    """Concatenated FAQ audio plus the byte-range index into it."""
+
+    version: str
+    output_format: str
+    audio: bytes
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    # True when every clip came from the best provider the dispatcher's mode can
+    # use (the upstream voice, or the local engine when that is all there is).
+    complete: bool = True
+    built_at: float = field(default_factory=time.monotonic)
+
+    def manifest(self, url: str) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "output_format": self.output_format,
+            "url": url,
+            "size": len(self.audio),
+            "entries": self.entries,
+        }
+
+
+class FAQBundleBuilder:
+    """
+    Build and memoize FAQ audio bundles per output format.
+
+    Clips are produced through the regular dispatcher, so they share its audio
+    cache and request coalescing. The bundle version combines the corpus hash,
+    voice, format and the providers that produced the clips, so a bundle
+    rendered (partly) by the local fallback never shadows the upstream one.
+    Such stop-gap bundles are only kept for the dispatcher's cooldown before a
+    rebuild is attempted; a bundle from the local engine is final when the
+    upstream is not in use at all. The previous bundle of each format stays
+    downloadable after a rebuild, for clients still holding its manifest.
+    """
+
+    def __init__(self, dispatcher: TTSDispatcher) -> None:
+        self.dispatcher = dispatcher
+        self._bundles: Dict[str, FAQBundle] = {}
+        self._previous: Dict[str, FAQBundle] = {}
+        self._lock = asyncio.Lock()
+
+    def _target_provider(self) -> str:
+        """The provider a complete bundle is rendered by in the current mode."""
+
+        dispatcher = self.dispatcher
+        if dispatcher.mode == "local":
+            return dispatcher.fallback.name
+        if dispatcher.mode == "auto" and not dispatcher.upstream.is_available():
+            return dispatcher.fallback.name
+        return dispatcher.upstream.name
+
+    def _fresh(self, bundle: FAQBundle | None) -> bool:
+        if bundle is None:
+            return False
+        return bundle.complete or time.monotonic() - bundle.built_at < self.dispatcher.cooldown
+
+    async def get(self, output_format: OutputFormat) -> FAQBundle:
+        bundle = self._bundles.get(output_format.name)
+        if self._fresh(bundle):
+            return bundle
+        async with self._lock:
+            bundle = self._bundles.get(output_format.name)
+            if self._fresh(bundle):
+                return bundle
+            previous = self._bundles.get(output_format.name)
+            bundle = await self._build(output_format)
+            if previous is not None and previous.version != bundle.version:
+                self._previous[output_format.name] = previous
+            self._bundles[output_format.name] = bundle
+            metrics.increment("tts_faq_bundle_builds_total", complete=str(bundle.complete).lower())
+            return bundle
+
+    async def get_version(self, output_format: OutputFormat, version: str) -> FAQBundle | None:
+        """The current or previous bundle with `version`, without forcing a rebuild."""
+
+        for bundle in (
+            self._bundles.get(output_format.name),
+            self._previous.get(output_format.name),
+        ):
+            if bundle is not None and bundle.version == version:
+                return bundle
+        if output_format.name in self._bundles:
+            return None
+        # Nothing built yet in this process (e.g. after a restart).
+        bundle = await self.get(output_format)
+        return bundle if bundle.version == version else None
+
+    async def _build(self, output_format: OutputFormat) -> FAQBundle:
+        semaphore = asyncio.Semaphore(BUILD_CONCURRENCY)
+
+        async def render(text: str):
+            async with semaphore:
+                return await self.dispatcher.synthesize(text, output_format=output_format)
+
+        texts = [_speech_text(faq.answer, faq.spoken) for faq in FAQ_DATABASE]
+        results = await asyncio.gather(*(render(text) for text in texts))
+
+        entries: List[Dict[str, Any]] = []
+        offset = 0
+        for faq, result in zip(FAQ_DATABASE, results):
+            entries.append(
+                {
+                    "question": faq.question,
+                    "answer": faq.answer,
+                    "offset": offset,
+                    "length": len(result.audio),
+                    "media_type": result.media_type,
+                    "provider": result.provider,
+                }
+            )
+            offset += len(result.audio)
+
+        providers = sorted({result.provider for result in results})
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [self.dispatcher.default_voice_id, output_format.name, providers]
+            ).encode("utf-8")
+        ).hexdigest()[:8]
+        return FAQBundle(
+            version=f"{corpus_version()}-{fingerprint}",
+            output_format=output_format.name,
+            audio=b"".join(result.audio for result in results),
+            entries=entries,
+            complete=providers == [self._target_provider()],
+        )
+
+
+@lru_cache(maxsize=1)
+def get_faq_bundle_builder() -> FAQBundleBuilder:
+    return FAQBundleBuilder(get_tts_dispatcher())
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    """An audio encoding we can ask a provider for."""
+
+    name: str
+    elevenlabs_code: str
+    media_type: str
+    extension: str
+
+
+OUTPUT_FORMATS: Dict[str, OutputFormat] = {
+    "mp3": OutputFormat("mp3", "mp3_44100_128", "audio/mpeg", "mp3"),
+    "mp3_low": OutputFormat("mp3_low", "mp3_22050_32", "audio/mpeg", "mp3"),
+    "opus": OutputFormat("opus", "opus_48000_32", "audio/ogg", "ogg"),
+    "pcm": OutputFormat("pcm", "pcm_16000", "audio/L16;rate=16000", "pcm"),
+}
+DEFAULT_FORMAT = OUTPUT_FORMATS["mp3"]
+MOBILE_FORMAT = OUTPUT_FORMATS["mp3_low"]
+
+# Accept media types we understand, mapped to the format name they select.
+_ACCEPT_MAP = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/l16": "pcm",
+    "audio/pcm": "pcm",
+}
+
+_MOBILE_UA_MARKERS = ("mobi", "android", "iphone", "ipad", "ipod")
+
+
+def is_mobile_client(user_agent: Optional[str], ch_mobile: Optional[str] = None) -> bool:
+    """Detect mobile clients from the `Sec-CH-UA-Mobile` hint or the User-Agent."""
+
+    if ch_mobile is not None:
+        return ch_mobile.strip() == "?1"
+    lowered = (user_agent or "").lower()
+    return any(marker in lowered for marker in _MOBILE_UA_MARKERS)
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges: List[Tuple[str, float]] = []
+    for index, part in enumerate(accept.split(",")):
+        pieces = [piece.strip() for piece in part.split(";")]
+        media_type = pieces[0].lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in pieces[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        # Earlier entries win ties, matching browser preference order.
+        ranges.append((media_type, quality - index * 1e-6))
+    return sorted(ranges, key=lambda item: item[1], reverse=True)
+
+
+def negotiate_format(
+    requested: Optional[str] = None,
+    accept: Optional[str] = None,
+    mobile: bool = False,
+) -> OutputFormat:
+    """
+    Pick the output format for a TTS request.
+
+    An explicit `requested` name wins and is used as given. Otherwise the best
+    supported `Accept` entry is used, and MP3 (from `Accept` or the default)
+    is downgraded to the low-bitrate encoding for mobile clients.
+    """
+
+    if requested:
+        try:
+            return OUTPUT_FORMATS[requested]
+        except KeyError:
+            allowed = ", ".join(OUTPUT_FORMATS)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported output_format '{requested}'. Choose one of: {allowed}.",
+            )
+
+    chosen = DEFAULT_FORMAT
+    for media_type, quality in _parse_accept(accept or ""):
+        if quality <= 0:
+            continue
+        if media_type in _ACCEPT_MAP:
+            chosen = OUTPUT_FORMATS[_ACCEPT_MAP[media_type]]
+            break
+
+    if mobile and chosen is DEFAULT_FORMAT:
+        return MOBILE_FORMAT
+    return chosen
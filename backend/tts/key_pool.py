@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+from ..config import ElevenLabsKeyConfig, get_settings
+from ..metrics import metrics
+
+DEFAULT_THROTTLE_SECONDS = 30.0
+# Rejected credentials stay out of rotation much longer than rate limits.
+AUTH_FAILURE_SECONDS = 3600.0
+
+
+class KeyPoolExhausted(HTTPException):
+    """Every pooled key is busy, throttled or out of quota; a local condition, not an outage."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=503,
+            detail="All ElevenLabs API keys are busy, throttled or out of quota.",
+        )
+
+
+@dataclass
+class KeyState:
+    """Live accounting for one pooled API key."""
+
+    config: ElevenLabsKeyConfig
+    outstanding: int = 0
+    requests: int = 0
+    characters_used: int = 0
+    throttles: int = 0
+    throttled_until: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return f"...{self.config.api_key[-4:]}"
+
+    @property
+    def remaining_quota(self) -> Optional[int]:
+        if self.config.character_quota is None:
+            return None
+        return max(self.config.character_quota - self.characters_used, 0)
+
+    def load(self) -> float:
+        if self.config.max_concurrency:
+            return self.outstanding / self.config.max_concurrency
+        return float(self.outstanding)
+
+    def accepts(self, characters: int, now: float) -> bool:
+        if now < self.throttled_until:
+            return False
+        if self.config.max_concurrency and self.outstanding >= self.config.max_concurrency:
+            return False
+        remaining = self.remaining_quota
+        return remaining is None or remaining >= characters
+
+
+class KeyPool:
+    """
+    Spread ElevenLabs calls across several API keys.
+
+    Each call leases the eligible key with the lowest relative load, breaking
+    ties by the most remaining character quota. Keys that hit their
+    concurrency cap or quota are skipped, and keys the upstream throttles are
+    taken out of rotation until their back-off expires.
+    """
+
+    def __init__(self, configs: Sequence[ElevenLabsKeyConfig]) -> None:
+        self._keys: List[KeyState] = [KeyState(config=config) for config in configs]
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self._keys)
+
+    def _pick(self, characters: int) -> KeyState:
+        now = time.monotonic()
+        eligible = [key for key in self._keys if key.accepts(characters, now)]
+        if not eligible:
+            raise KeyPoolExhausted()
+
+        def rank(state: KeyState) -> tuple[float, float]:
+            remaining = state.remaining_quota
+            return state.load(), -(float("inf") if remaining is None else remaining)
+
+        return min(eligible, key=rank)
+
+    @contextmanager
+    def lease(self, characters: int) -> Iterator[KeyState]:
+        """Reserve a key for one request; usage is recorded on success."""
+
+        with self._lock:
+            state = self._pick(characters)
+            state.outstanding += 1
+            state.requests += 1
+        succeeded = False
+        try:
+            yield state
+            succeeded = True
+        finally:
+            with self._lock:
+                state.outstanding -= 1
+                if succeeded:
+                    state.characters_used += characters
+            metrics.increment(
+                "tts_key_requests_total",
+                key=state.label,
+                outcome="ok" if succeeded else "error",
+            )
+
+    def mark_throttled(self, state: KeyState, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            state.throttles += 1
+            state.throttled_until = time.monotonic() + (retry_after or DEFAULT_THROTTLE_SECONDS)
+        metrics.increment("tts_key_throttles_total", key=state.label)
+
+    def mark_rejected(self, state: KeyState) -> None:
+        self.mark_throttled(state, AUTH_FAILURE_SECONDS)
+
+    def usage(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": state.label,
+                    "outstanding": state.outstanding,
+                    "max_concurrency": state.config.max_concurrency,
+                    "requests": state.requests,
+                    "characters_used": state.characters_used,
+                    "character_quota": state.config.character_quota,
+                    "remaining_quota": state.remaining_quota,
+                    "throttles": state.throttles,
+                    "throttled_for_seconds": max(round(state.throttled_until - now, 1), 0.0),
+                }
+                for state in self._keys
+            ]
+
+
+@lru_cache(maxsize=1)
+def get_key_pool() -> KeyPool:
+    return KeyPool(get_settings().elevenlabs_key_pool)
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import math
+import random
+import re
+import sys
+import wave
+from array import array
+from typing import Iterable, List, Tuple
+
+from .base import SynthesisResult, TTSProvider
+from .formats import OutputFormat
+from .policy import DEFAULT_PARAMS, SynthesisParams
+
+SAMPLE_RATE = 16000
+
+# Rough formant targets (F1, F2, F3 in Hz) for an adult speaker.
+_VOWELS = {
+    "a": (730, 1090, 2440),
+    "e": (530, 1840, 2480),
+    "i": (270, 2290, 3010),
+    "o": (570, 840, 2410),
+    "u": (300, 870, 2240),
+    "y": (270, 2290, 3010),
+}
+_SONORANTS = {
+    "m": (280, 900, 2200),
+    "n": (280, 1700, 2600),
+    "l": (360, 1300, 2700),
+    "r": (420, 1300, 1600),
+    "w": (300, 610, 2200),
+}
+# Fricatives: (noise centre frequency, amplitude, voiced)
+_FRICATIVES = {
+    "s": (5000, 0.35, False),
+    "z": (4500, 0.25, True),
+    "f": (1800, 0.20, False),
+    "v": (1500, 0.15, True),
+    "h": (1200, 0.15, False),
+    "j": (2500, 0.30, True),
+}
+# Plosives: (burst centre frequency, voiced)
+_PLOSIVES = {
+    "p": (900, False),
+    "b": (900, True),
+    "t": (3500, False),
+    "d": (3000, True),
+    "k": (2000, False),
+    "g": (1800, True),
+}
+_ALIASES = {"c": "k", "q": "k", "x": "ks"}
+_DIGITS = {
+    "0": "zero",
+    "1": "one",
+    "2": "two",
+    "3": "three",
+    "4": "four",
+    "5": "five",
+    "6": "six",
+    "7": "seven",
+    "8": "eight",
+    "9": "nine",
+}
+
+_SHORT_PAUSE = ",;:-"
+_LONG_PAUSE = ".!?"
+
+Segment = Tuple[str, str]
+
+
+def _segments(text: str) -> List[Segment]:
+    """Break text into (kind, symbol) units understood by the renderer."""
+
+    text = re.sub(r"\d", lambda match: f" {_DIGITS[match.group()]} ", text.lower())
+    segments: List[Segment] = []
+    for char in text:
+        for symbol in _ALIASES.get(char, char):
+            if symbol in _VOWELS:
+                segments.append(("vowel", symbol))
+            elif symbol in _SONORANTS:
+                segments.append(("sonorant", symbol))
+            elif symbol in _FRICATIVES:
+                segments.append(("fricative", symbol))
+            elif symbol in _PLOSIVES:
+                segments.append(("plosive", symbol))
+            elif symbol in _LONG_PAUSE:
+                segments.append(("pause", "long"))
+            elif symbol in _SHORT_PAUSE:
+                segments.append(("pause", "short"))
+            elif symbol.isspace() and segments and segments[-1][0] != "pause":
+                segments.append(("pause", "word"))
+    return segments
+
+
+def _coefficients(freq: float, bandwidth: float) -> Tuple[float, float, float]:
+    """Klatt-style two-pole resonator coefficients (a, b, c)."""
+
+    t = 1.0 / SAMPLE_RATE
+    c = -math.exp(-2.0 * math.pi * bandwidth * t)
+    b = 2.0 * math.exp(-math.pi * bandwidth * t) * math.cos(2.0 * math.pi * freq * t)
+    return 1.0 - b - c, b, c
+
+
+class _Synth:
+    """Cascade formant synthesizer with a sawtooth glottal source."""
+
+    def __init__(self, total_segments: int) -> None:
+        self.samples = array("f")
+        self.rng = random.Random(0)
+        self.phase = 0.0
+        self.state = [0.0] * 6
+        self.noise_state = [0.0, 0.0]
+        self.total = max(total_segments, 1)
+        self.index = 0
+
+    def _pitch(self) -> float:
+        # Gentle declination across the utterance sounds less robotic.
+        return 125.0 - 25.0 * (self.index / self.total)
+
+    def voiced(self, formants: Iterable[float], duration_ms: int, gain: float) -> None:
+        count = SAMPLE_RATE * duration_ms // 1000
+        ramp = max(count // 8, 1)
+        (a1, b1, c1), (a2, b2, c2), (a3, b3, c3) = (
+            _coefficients(freq, 60.0 + freq * 0.05) for freq in formants
+        )
+        y1, y1b, y2, y2b, y3, y3b = self.state
+        phase = self.phase
+        step = self._pitch() / SAMPLE_RATE
+        append = self.samples.append
+        for n in range(count):
+            phase += step
+            if phase >= 1.0:
+                phase -= 1.0
+            source = 1.0 - 2.0 * phase
+            out1 = a1 * source + b1 * y1 + c1 * y1b
+            y1b, y1 = y1, out1
+            out2 = a2 * out1 + b2 * y2 + c2 * y2b
+            y2b, y2 = y2, out2
+            out3 = a3 * out2 + b3 * y3 + c3 * y3b
+            y3b, y3 = y3, out3
+            envelope = min(1.0, n / ramp, (count - n) / ramp)
+            append(out3 * gain * envelope)
+        self.state = [y1, y1b, y2, y2b, y3, y3b]
+        self.phase = phase
+
+    def noise(self, centre: float, duration_ms: int, gain: float, voiced: bool) -> None:
+        count = SAMPLE_RATE * duration_ms // 1000
+        ramp = max(count // 6, 1)
+        a, b, c = _coefficients(min(centre, SAMPLE_RATE / 2 - 500), centre * 0.4)
+        y1, y2 = self.noise_state
+        phase = self.phase
+        step = self._pitch() / SAMPLE_RATE
+        rand = self.rng.uniform
+        append = self.samples.append
+        for n in range(count):
+            out = a * rand(-1.0, 1.0) + b * y1 + c * y2
+            y2, y1 = y1, out
+            sample = out
+            if voiced:
+                phase += step
+                if phase >= 1.0:
+                    phase -= 1.0
+                sample += 0.15 * (1.0 - 2.0 * phase)
+            envelope = min(1.0, n / ramp, (count - n) / ramp)
+            append(sample * gain * envelope)
+        self.noise_state = [y1, y2]
+        self.phase = phase
+
+    def silence(self, duration_ms: int) -> None:
+        self.samples.extend([0.0] * (SAMPLE_RATE * duration_ms // 1000))
+
+    def render(self, segments: List[Segment]) -> array:
+        for kind, symbol in segments:
+            if kind == "vowel":
+                self.voiced(_VOWELS[symbol], 90, 1.0)
+            elif kind == "sonorant":
+                self.voiced(_SONORANTS[symbol], 60, 0.5)
+            elif kind == "fricative":
+                centre, gain, voiced = _FRICATIVES[symbol]
+                self.noise(centre, 80, gain, voiced)
+            elif kind == "plosive":
+                centre, voiced = _PLOSIVES[symbol]
+                self.silence(25)
+                self.noise(centre, 20, 0.4, voiced)
+            else:
+                self.silence({"word": 50, "short": 150, "long": 250}[symbol])
+            self.index += 1
+        return self.samples
+
+
+def render_pcm(text: str) -> bytes:
+    """Synthesize `text` into raw 16 kHz mono signed 16-bit little-endian PCM."""
+
+    segments = _segments(text)
+    floats = _Synth(len(segments)).render(segments) if segments else array("f")
+    peak = max((abs(value) for value in floats), default=0.0) or 1.0
+    scale = 0.8 * 32767 / peak
+    pcm = array("h", (int(value * scale) for value in floats))
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def render_wav(text: str) -> bytes:
+    """Synthesize `text` into a 16 kHz mono 16-bit WAV file."""
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(render_pcm(text))
+    return buffer.getvalue()
+
+
+class LocalProvider(TTSProvider):
+    """
+    CPU-only formant synthesizer used when ElevenLabs is unavailable.
+
+    The voice is robotic but intelligible enough for fallback playback, and it
+    needs no network or API key, which also makes it a free load-test double.
+    """
+
+    name = "local"
+
+    def is_available(self) -> bool:
+        return True
+
+    def params_for(self, params: SynthesisParams) -> SynthesisParams:
+        # Model and latency settings do not apply; only chunking carries over.
+        return SynthesisParams(model_id=self.name, chunk_size=params.chunk_size)
+
+    def media_type_for(self, output_format: OutputFormat) -> str:
+        # Only PCM is produced natively; compressed formats are served as WAV.
+        return output_format.media_type if output_format.name == "pcm" else "audio/wav"
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None,
+        output_format: OutputFormat,
+        params: SynthesisParams = DEFAULT_PARAMS,
+    ) -> SynthesisResult:
+        media_type = self.media_type_for(output_format)
+        render = render_wav if media_type == "audio/wav" else render_pcm
+        audio = await asyncio.to_thread(render, text)
+        return SynthesisResult(
+            audio=audio,
+            media_type=media_type,
+            provider=self.name,
+            params=self.params_for(params),
+        )
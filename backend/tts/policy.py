@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Tuple
+
+QUALITY_MODEL = "eleven_multilingual_v2"
+TURBO_MODEL = "eleven_turbo_v2_5"
+FLASH_MODEL = "eleven_flash_v2_5"
+
+
+@dataclass(frozen=True)
+class SynthesisParams:
+    """Per-request upstream settings chosen by `TTSPolicy`."""
+
+    model_id: str = QUALITY_MODEL
+    optimize_streaming_latency: int = 0
+    chunk_size: int = 16384
+    stability: float = 0.55
+    similarity_boost: float = 0.75
+
+    def cache_parts(self) -> Tuple[object, ...]:
+        # chunk_size only affects how bytes are framed on the wire, not the audio.
+        return (
+            self.model_id,
+            self.optimize_streaming_latency,
+            self.stability,
+            self.similarity_boost,
+        )
+
+
+DEFAULT_PARAMS = SynthesisParams()
+
+
+class LatencyTracker:
+    """Rolling window of recent upstream latencies (seconds)."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class TTSPolicy:
+    """
+    Pick model, latency optimization and chunk size for each synthesis.
+
+    Short conversational replies favour the low-latency models, and the
+    fastest settings kick in when upstream p95 latency or the number of
+    in-flight requests shows the service is under pressure. Long passages
+    keep the multilingual model unless the upstream is struggling.
+    """
+
+    def __init__(
+        self,
+        short_text_chars: int = 200,
+        long_text_chars: int = 600,
+        slow_p95_seconds: float = 2.5,
+        busy_in_flight: int = 8,
+    ) -> None:
+        self.short_text_chars = short_text_chars
+        self.long_text_chars = long_text_chars
+        self.slow_p95_seconds = slow_p95_seconds
+        self.busy_in_flight = busy_in_flight
+        self.latency = LatencyTracker()
+
+    def under_pressure(self, in_flight: int) -> bool:
+        p95 = self.latency.percentile(95)
+        slow = p95 is not None and p95 >= self.slow_p95_seconds
+        return slow or in_flight >= self.busy_in_flight
+
+    def choose(self, text: str, in_flight: int = 0) -> SynthesisParams:
+        return self._for_length(len(text), self.under_pressure(in_flight))
+
+    def candidates(self, text: str) -> Tuple[SynthesisParams, ...]:
+        """
+        Every parameter set `choose` may return for `text`, relaxed choice first.
+
+        Audio cached under any of them is acceptable, so lookups try each
+        before load decides what a miss synthesizes.
+        """
+
+        relaxed = self._for_length(len(text), pressured=False)
+        pressured = self._for_length(len(text), pressured=True)
+        return (relaxed,) if pressured == relaxed else (relaxed, pressured)
+
+    def _for_length(self, length: int, pressured: bool) -> SynthesisParams:
+        if length <= self.short_text_chars:
+            if pressured:
+                return SynthesisParams(
+                    model_id=FLASH_MODEL,
+                    optimize_streaming_latency=3,
+                    chunk_size=4096,
+                )
+            return SynthesisParams(
+                model_id=TURBO_MODEL,
+                optimize_streaming_latency=2,
+                chunk_size=8192,
+            )
+
+        if pressured:
+            return SynthesisParams(
+                model_id=TURBO_MODEL,
+                optimize_streaming_latency=1 if length > self.long_text_chars else 2,
+                chunk_size=8192,
+            )
+        return DEFAULT_PARAMS
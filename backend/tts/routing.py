@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import AsyncIterator, Iterable
+
+import httpx
+
+from ..config import DEFAULT_ELEVEN_VOICE_ID, get_settings
+from ..metrics import metrics
+from ..singleflight import SharedStream, SingleFlight
+from .base import SynthesisResult, TTSProvider, UpstreamError, iter_chunks
+from .cache import AudioCache, audio_cache_key
+from .elevenlabs_client import ElevenLabsProvider
+from .formats import DEFAULT_FORMAT, OutputFormat
+from .key_pool import KeyPoolExhausted
+from .local_engine import LocalProvider
+from .policy import SynthesisParams, TTSPolicy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioStream:
+    """Audio being produced incrementally, plus how to serve it."""
+
+    media_type: str
+    provider: str
+    params: SynthesisParams
+    chunks: AsyncIterator[bytes]
+    cache_hit: bool = False
+    coalesced: bool = False
+
+
+@dataclass
+class _LiveStream:
+    media_type: str
+    provider: str
+    params: SynthesisParams
+    shared: SharedStream
+
+
+def _is_outage(exc: BaseException) -> bool:
+    """
+    True for failures that say the upstream itself is unhealthy: transport
+    errors, timeouts and 5xx responses. Rejections (4xx, 429) and an
+    exhausted key pool only affect the request at hand.
+    """
+
+    if isinstance(exc, UpstreamError):
+        return exc.upstream_status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, httpx.TransportError))
+
+
+async def _replay(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+class TTSDispatcher:
+    """
+    Route synthesis between the upstream provider and the local fallback.
+
+    `mode` is one of:
+    - "auto": use the upstream when configured, falling back to the local engine
+      when it errors, exceeds `upstream_timeout` or is cooling down after an
+      outage (transport error, timeout or 5xx; see `_is_outage`).
+    - "elevenlabs": upstream only (errors surface to the caller).
+    - "local": local engine only, e.g. for offline load tests.
+
+    Upstream parameters come from `policy`, which sees the number of requests
+    in flight and the latencies recorded here. Upstream audio is cached by text,
+    voice, output format and those parameters; lookups accept audio cached under
+    any parameters the policy might pick for the text, so a change in load does
+    not turn hits into misses. Fallback audio is not cached so the upstream
+    voice returns once it recovers.
+
+    Concurrent requests with the same cache key share one synthesis: buffered
+    calls await a single in-flight task, and stream subscribers each get their
+    own replay of one shared upstream stream. All but the first are marked
+    `coalesced`.
+    """
+
+    def __init__(
+        self,
+        upstream: TTSProvider,
+        fallback: TTSProvider,
+        mode: str = "auto",
+        upstream_timeout: float = 8.0,
+        cooldown: float = 30.0,
+        cache: AudioCache | None = None,
+        default_voice_id: str = DEFAULT_ELEVEN_VOICE_ID,
+        policy: TTSPolicy | None = None,
+    ) -> None:
+        self.upstream = upstream
+        self.fallback = fallback
+        self.mode = mode
+        self.upstream_timeout = upstream_timeout
+        self.cooldown = cooldown
+        self.cache = cache
+        self.default_voice_id = default_voice_id
+        self.policy = policy or TTSPolicy()
+        self._upstream_down_until = 0.0
+        self._in_flight = 0
+        self._flight: SingleFlight[SynthesisResult] = SingleFlight("tts")
+        self._stream_flight: SingleFlight[_LiveStream] = SingleFlight("tts_stream")
+        self._live_streams: dict[str, _LiveStream] = {}
+
+    def _upstream_healthy(self) -> bool:
+        return time.monotonic() >= self._upstream_down_until
+
+    def _mark_upstream_down(self) -> None:
+        self._upstream_down_until = time.monotonic() + self.cooldown
+
+    def _fall_back(self, exc: BaseException, what: str) -> None:
+        """Log why `what` falls back; only upstream outages start the cooldown."""
+
+        outage = _is_outage(exc)
+        if outage:
+            reason = "outage"
+        elif isinstance(exc, KeyPoolExhausted):
+            reason = "keys_exhausted"
+        else:
+            reason = "rejected"
+        metrics.increment("tts_fallbacks_total", reason=reason)
+        logger.warning(
+            "%s (%s) unavailable, using %s%s: %r",
+            what,
+            self.upstream.name,
+            self.fallback.name,
+            "" if outage else " for this request",
+            exc,
+        )
+        if outage:
+            self._mark_upstream_down()
+
+    def _cached(
+        self,
+        text: str,
+        voice: str,
+        output_format: OutputFormat,
+    ) -> SynthesisResult | None:
+        if self.cache is None:
+            return None
+        for params in self.policy.candidates(text):
+            cached = self.cache.get(
+                audio_cache_key(text, voice, output_format.name, *params.cache_parts())
+            )
+            if cached is not None:
+                return cached
+        return None
+
+    def _use_upstream(self) -> bool:
+        if self.mode == "local":
+            return False
+        if self.mode == "elevenlabs":
+            return True
+        return self.upstream.is_available() and self._upstream_healthy()
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        output_format: OutputFormat = DEFAULT_FORMAT,
+    ) -> SynthesisResult:
+        voice = voice_id or self.default_voice_id
+        cached = self._cached(text, voice, output_format)
+        if cached is not None:
+            self._record(cached, cache="hit")
+            return replace(cached, cache_hit=True)
+
+        params = self.policy.choose(text, self._in_flight)
+        key = audio_cache_key(text, voice, output_format.name, *params.cache_parts())
+        result, coalesced = await self._flight.call(
+            key,
+            lambda: self._synthesize_shared(key, text, voice, output_format, params),
+        )
+        return replace(result, coalesced=True) if coalesced else result
+
+    async def _synthesize_shared(
+        self,
+        key: str,
+        text: str,
+        voice: str,
+        output_format: OutputFormat,
+        params: SynthesisParams,
+    ) -> SynthesisResult:
+        self._in_flight += 1
+        metrics.set_gauge("tts_in_flight", self._in_flight)
+        try:
+            result = await self._synthesize_uncached(text, voice, output_format, params)
+        finally:
+            self._in_flight -= 1
+            metrics.set_gauge("tts_in_flight", self._in_flight)
+
+        # Fallback results keep the local engine's own settings.
+        if result.provider == self.upstream.name:
+            result = replace(result, params=params)
+        if self.cache is not None and result.provider == self.upstream.name:
+            self.cache.put(key, result)
+        self._record(result, cache="miss")
+        return result
+
+    def _record(self, result: SynthesisResult, cache: str) -> None:
+        metrics.increment(
+            "tts_requests_total",
+            cache=cache,
+            provider=result.provider,
+            model=result.params.model_id,
+            latency_mode=result.params.optimize_streaming_latency,
+        )
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        output_format: OutputFormat = DEFAULT_FORMAT,
+    ) -> AudioStream:
+        """
+        Start synthesis and return an `AudioStream` relaying chunks as they arrive.
+
+        The upstream's first chunk is awaited here (bounded by `upstream_timeout`)
+        so that failures can still fall back before any bytes reach the client.
+        Closing the returned iterator early cancels the upstream HTTP stream.
+        """
+
+        voice = voice_id or self.default_voice_id
+        cached = self._cached(text, voice, output_format)
+        if cached is not None:
+            self._record(cached, cache="hit")
+            return AudioStream(
+                media_type=cached.media_type,
+                provider=cached.provider,
+                params=cached.params,
+                chunks=_replay(iter_chunks(cached.audio, cached.params.chunk_size)),
+                cache_hit=True,
+            )
+
+        params = self.policy.choose(text, self._in_flight)
+        key = audio_cache_key(text, voice, output_format.name, *params.cache_parts())
+        live = self._live_streams.get(key)
+        if live is None:
+            live = await self._stream_flight.do(
+                key,
+                lambda: self._open_stream(key, text, voice, output_format, params),
+            )
+        else:
+            metrics.increment("singleflight_calls_total", flight="tts_stream", role="follower")
+        chunks, coalesced = live.shared.subscribe()
+        return AudioStream(
+            media_type=live.media_type,
+            provider=live.provider,
+            params=live.params,
+            chunks=chunks,
+            coalesced=coalesced,
+        )
+
+    async def _open_stream(
+        self,
+        key: str,
+        text: str,
+        voice: str,
+        output_format: OutputFormat,
+        params: SynthesisParams,
+    ) -> _LiveStream:
+        provider = self.upstream if self._use_upstream() else self.fallback
+        chunks = provider.stream(text, voice, output_format, params)
+        first = b""
+        if provider is self.upstream:
+            started = time.perf_counter()
+            try:
+                first = await asyncio.wait_for(chunks.__anext__(), timeout=self.upstream_timeout)
+            except StopAsyncIteration:
+                pass
+            except Exception as exc:
+                await chunks.aclose()
+                if self.mode == "elevenlabs":
+                    raise
+                self._fall_back(exc, "Upstream TTS stream")
+                provider = self.fallback
+                chunks = provider.stream(text, voice, output_format, params)
+            else:
+                metrics.observe(
+                    "tts_upstream_ttfb_seconds",
+                    time.perf_counter() - started,
+                    model=params.model_id,
+                )
+
+        media_type = provider.media_type_for(output_format)
+        params = provider.params_for(params)
+        shared = SharedStream(self._relay(key, first, chunks, provider.name, media_type, params))
+        live = _LiveStream(
+            media_type=media_type,
+            provider=provider.name,
+            params=params,
+            shared=shared,
+        )
+        self._live_streams[key] = live
+        shared.pump.add_done_callback(lambda _task: self._forget_stream(key, live))
+        return live
+
+    def _forget_stream(self, key: str, live: _LiveStream) -> None:
+        if self._live_streams.get(key) is live:
+            del self._live_streams[key]
+
+    async def _relay(
+        self,
+        key: str,
+        first: bytes,
+        chunks: AsyncIterator[bytes],
+        provider: str,
+        media_type: str,
+        params: SynthesisParams,
+    ) -> AsyncIterator[bytes]:
+        buffered = [first] if first else []
+        self._in_flight += 1
+        metrics.set_gauge("tts_in_flight", self._in_flight)
+        try:
+            if first:
+                yield first
+            async for chunk in chunks:
+                buffered.append(chunk)
+                yield chunk
+        finally:
+            self._in_flight -= 1
+            metrics.set_gauge("tts_in_flight", self._in_flight)
+            await chunks.aclose()
+
+        # Only reached when the stream ran to completion (not on disconnect).
+        result = SynthesisResult(
+            audio=b"".join(buffered),
+            media_type=media_type,
+            provider=provider,
+            params=params,
+        )
+        if self.cache is not None and provider == self.upstream.name:
+            self.cache.put(key, result)
+        self._record(result, cache="miss")
+
+    async def _call_upstream(
+        self,
+        text: str,
+        voice_id: str,
+        output_format: OutputFormat,
+        params: SynthesisParams,
+    ) -> SynthesisResult:
+        started = time.perf_counter()
+        try:
+            return await self.upstream.synthesize(text, voice_id, output_format, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.policy.latency.record(elapsed)
+            metrics.observe("tts_upstream_latency_seconds", elapsed, model=params.model_id)
+
+    async def _synthesize_uncached(
+        self,
+        text: str,
+        voice_id: str,
+        output_format: OutputFormat,
+        params: SynthesisParams,
+    ) -> SynthesisResult:
+        if self.mode == "local":
+            return await self.fallback.synthesize(text, voice_id, output_format, params)
+        if self.mode == "elevenlabs":
+            return await self._call_upstream(text, voice_id, output_format, params)
+
+        if not self.upstream.is_available() or not self._upstream_healthy():
+            return await self.fallback.synthesize(text, voice_id, output_format, params)
+
+        try:
+            return await asyncio.wait_for(
+                self._call_upstream(text, voice_id, output_format, params),
+                timeout=self.upstream_timeout,
+            )
+        except Exception as exc:
+            self._fall_back(exc, "Upstream TTS")
+            return await self.fallback.synthesize(text, voice_id, output_format, params)
+
+
+@lru_cache(maxsize=1)
+def get_tts_dispatcher() -> TTSDispatcher:
+    settings = get_settings()
+    return TTSDispatcher(
+        upstream=ElevenLabsProvider(),
+        fallback=LocalProvider(),
+        mode=settings.tts_provider,
+        upstream_timeout=settings.tts_upstream_timeout_seconds,
+        cooldown=settings.tts_upstream_cooldown_seconds,
+        cache=AudioCache(max_bytes=settings.tts_audio_cache_mb * 1024 * 1024),
+        default_voice_id=settings.elevenlabs_default_voice_id,
+    )
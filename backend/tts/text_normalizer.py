@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import re
+from typing import List
+
+
+def _unit(amount: int, singular: str, plural: str) -> str:
+    return f"{amount} {singular if amount == 1 else plural}"
+
+
+def _say_dollars(match: re.Match[str]) -> str:
+    # "$1,299.99" -> "1299 dollars and 99 cents"; thousands separators are
+    # dropped so the number is read as one amount.
+    dollars = int(match.group(1).replace(",", ""))
+    cents = int(match.group(2) or 0)
+    if not cents:
+        return _unit(dollars, "dollar", "dollars")
+    if not dollars:
+        return _unit(cents, "cent", "cents")
+    return f"{_unit(dollars, 'dollar', 'dollars')} and {_unit(cents, 'cent', 'cents')}"
+
+
+# Written forms that TTS voices read awkwardly, and what to say instead.
+_ABBREVIATIONS = [
+    (re.compile(r"\bSt\.(?=\s+[A-Z])"), "Saint"),
+    (re.compile(r"\bMt\.(?=\s+[A-Z])"), "Mount"),
+    (re.compile(r"\be\.g\.", re.IGNORECASE), "for example"),
+    (re.compile(r"\bi\.e\.", re.IGNORECASE), "that is"),
+    (re.compile(r"\betc\.", re.IGNORECASE), "and so on"),
+    (re.compile(r"\bapprox\.", re.IGNORECASE), "approximately"),
+    (re.compile(r"\bvs\.?(?=\s)", re.IGNORECASE), "versus"),
+    (re.compile(r"\bASE\b"), "A S E"),
+    (re.compile(r"\bSUV\b"), "S U V"),
+    (re.compile(r"\bBF Goodrich\b"), "B F Goodrich"),
+    (re.compile(r"\b(\d{1,2})\s?AM\b"), r"\1 A M"),
+    (re.compile(r"\b(\d{1,2})\s?PM\b"), r"\1 P M"),
+    (re.compile(r"(\d)\s?%"), r"\1 percent"),
+    (re.compile(r"\$(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{2}))?"), _say_dollars),
+    (re.compile(r"\s&\s"), " and "),
+]
+
+_URL = re.compile(
+    r"(?:\bour website at\s+)?"
+    r"(?:(?:https?://|www\.)\S+|\b[\w-]+\.(?:com|net|org|io|us)(?:/\S*)?)",
+    re.IGNORECASE,
+)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Enumerations longer than this are shortened to their first few items.
+MAX_LIST_ITEMS = 4
+KEEP_LIST_ITEMS = 3
+_MAX_ITEM_WORDS = 4
+
+
+def _is_list_item(part: str) -> bool:
+    words = part.rstrip(".!?").split()
+    if words and words[0] in ("and", "or"):
+        words = words[1:]
+    return 0 < len(words) <= _MAX_ITEM_WORDS
+
+
+def _collapse_lists(sentence: str) -> str:
+    parts = sentence.split(", ")
+    if len(parts) <= MAX_LIST_ITEMS:
+        return sentence
+
+    # The first part usually carries the lead-in ("brands including Michelin").
+    start = 1
+    end = start
+    while end < len(parts) and _is_list_item(parts[end]):
+        end += 1
+    # Only trailing enumerations are shortened; mid-sentence ones keep their shape.
+    if end != len(parts) or end - start + 1 <= MAX_LIST_ITEMS:
+        return sentence
+
+    last = parts[-1]
+    closing = last[-1] if last and last[-1] in ".!?" else ""
+    kept: List[str] = parts[: start + KEEP_LIST_ITEMS - 1]
+    return ", ".join(kept) + " and more" + closing
+
+
+def normalize_for_speech(text: str) -> str:
+    """
+    Rewrite display text into something shorter and cleaner to speak.
+
+    URLs are dropped (mentioned as "our website"), common abbreviations are
+    expanded and long comma-separated enumerations are cut to a few items.
+    """
+
+    text = _URL.sub("our website", text)
+    for pattern, replacement in _ABBREVIATIONS:
+        text = pattern.sub(replacement, text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    sentences = _SENTENCE_SPLIT.split(text)
+    return " ".join(_collapse_lists(sentence) for sentence in sentences)
@@ -0,0 +1,125 @@
+"""
+Appointment insert/read throughput with and without the SQLite performance profile.
+
+Usage:
+    python bench_appointments.py [--rows 500] [--readers 4] [--seconds 3]
+
+Each profile gets a fresh database file in a temporary directory. The insert
+phase commits one appointment per transaction (what the API does); the mixed
+phase runs reader threads listing and fetching appointments while a writer
+keeps inserting, which is where WAL stops readers from blocking. Before timing,
+the work-queue claim scan is checked to use the partial `status = 'new'` indexes.
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.config import get_settings
+from backend.db import install_sqlite_pragmas, sqlite_pragmas
+from backend.models.appointments import LegacyAppointmentCreate
+from backend.services import appointment_service
+
+
+def _payload(index: int) -> LegacyAppointmentCreate:
+    return LegacyAppointmentCreate(
+        name=f"Bench Customer {index}",
+        location=random.choice(["Chesterfield", "Ballwin", "Kirkwood"]),
+        serviceType=random.choice(["Oil Change", "Tires", "Brakes"]),
+        preferredDate="2024-01-15",
+        preferredTime="morning",
+        phone="555-0100",
+    )
+
+
+def _build_engine(path: Path, profile: str):
+    settings = replace(get_settings(), sqlite_profile=profile)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+    install_sqlite_pragmas(engine, sqlite_pragmas(settings))
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def check_claim_plan(engine) -> None:
+    """Fail unless EXPLAIN QUERY PLAN shows the claim scan on a work-queue index."""
+
+    for location in (None, "Chesterfield"):
+        candidate = appointment_service.claim_candidate(location, datetime.utcnow(), 900)
+        sql = candidate.compile(engine, compile_kwargs={"literal_binds": True})
+        with engine.connect() as connection:
+            rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+            plan = " ".join(row[-1] for row in rows)
+        if "ix_appointments_new_status_" not in plan:
+            raise SystemExit(f"Claim scan does not use a work-queue index: {plan}")
+
+
+def bench_inserts(engine, rows: int) -> float:
+    started = time.perf_counter()
+    for index in range(rows):
+        with Session(engine) as session:
+            appointment_service.create_appointment(_payload(index), session)
+    return rows / (time.perf_counter() - started)
+
+
+def bench_mixed(engine, readers: int, seconds: float, max_id: int) -> tuple[float, float]:
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def reader(slot: int) -> None:
+        while not stop.is_set():
+            with Session(engine) as session:
+                appointment_service.list_appointments(session)
+                appointment_service.get_appointment_by_id(random.randint(1, max_id), session)
+            reads[slot] += 1
+
+    def writer() -> None:
+        while not stop.is_set():
+            with Session(engine) as session:
+                appointment_service.create_appointment(_payload(writes[0]), session)
+            writes[0] += 1
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, writes[0] / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'inserts/s':>10} {'mixed reads/s':>14} {'mixed writes/s':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("default", "performance"):
+            engine = _build_engine(Path(tmp) / f"{profile}.db", profile)
+            check_claim_plan(engine)
+            inserts = bench_inserts(engine, args.rows)
+            reads, writes = bench_mixed(engine, args.readers, args.seconds, args.rows)
+            engine.dispose()
+            print(f"{profile:<12} {inserts:>10.0f} {reads:>14.0f} {writes:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ import { cn } from "@/lib/utils";
 import { useToast } from "@/hooks/use-toast";
 import AppointmentForm from "./AppointmentForm";
 import { useChat } from "@/hooks/useChat";
-import { fetchTtsAudio } from "@/lib/api";
+import { fetchFaqAudioBundle, fetchTtsAudio } from "@/lib/api";
 import { playAudioFromArrayBuffer, type AudioController } from "@/lib/audio";
 import type { Appointment, ChatResponse } from "@/types/api";
 
@@ -53,6 +53,8 @@ export default function ChatWidget() {
   const recognitionRef = useRef<any>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const currentAudioRef = useRef<AudioController | null>(null);
+  const ttsAbortRef = useRef<AbortController | null>(null);
+  const faqAudioRef = useRef<Map<string, ArrayBuffer> | null>(null);
   const { toast } = useToast();
   const { sendMessage, isLoading: isChatLoading } = useChat();
 
@@ -63,6 +65,28 @@ export default function ChatWidget() {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
   }, [messages]);
 
+  // Prefetch pre-synthesized FAQ answers once, while the browser is idle.
+  useEffect(() => {
+    if (!isOpen || !voiceReplyEnabled || faqAudioRef.current) {
+      return;
+    }
+
+    const prefetch = () => {
+      fetchFaqAudioBundle()
+        .then((clips) => {
+          faqAudioRef.current = clips;
+        })
+        .catch((error) => console.warn("FAQ audio prefetch failed:", error));
+    };
+
+    if ("requestIdleCallback" in window) {
+      const handle = (window as any).requestIdleCallback(prefetch, { timeout: 5000 });
+      return () => (window as any).cancelIdleCallback(handle);
+    }
+    const handle = window.setTimeout(prefetch, 1000);
+    return () => window.clearTimeout(handle);
+  }, [isOpen, voiceReplyEnabled]);
+
   useEffect(() => {
     const isSecureContext =
       window.isSecureContext ||
@@ -136,6 +160,10 @@ export default function ChatWidget() {
   }, []);
 
   const stopAudio = () => {
+    if (ttsAbortRef.current) {
+      ttsAbortRef.current.abort();
+      ttsAbortRef.current = null;
+    }
     if (currentAudioRef.current) {
       currentAudioRef.current.stop();
       currentAudioRef.current = null;
@@ -164,8 +192,18 @@ export default function ChatWidget() {
       // Stop any currently playing audio before starting new one
       stopAudio();
 
+      const abortController = new AbortController();
+      ttsAbortRef.current = abortController;
+
       try {
-        const buffer = await fetchTtsAudio({ text: assistantText });
+        // Copy prefetched clips: decoding may detach the buffer it is given.
+        const prefetched = faqAudioRef.current?.get(assistantText);
+        const buffer = prefetched
+          ? prefetched.slice(0)
+          : await fetchTtsAudio({ text: assistantText }, abortController.signal);
+        if (ttsAbortRef.current === abortController) {
+          ttsAbortRef.current = null;
+        }
         const controller = await playAudioFromArrayBuffer(buffer);
         currentAudioRef.current = controller;
         setIsPlayingAudio(true);
@@ -175,6 +213,9 @@ export default function ChatWidget() {
           currentAudioRef.current = null;
         };
       } catch (error) {
+        if (abortController.signal.aborted) {
+          return;
+        }
         console.error("Voice agent error:", error);
         toast({
           title: "Voice agent unavailable",
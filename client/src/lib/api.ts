@@ -3,6 +3,7 @@ import type {
   AppointmentCreate,
   ChatRequest,
   ChatResponse,
+  FAQAudioBundleManifest,
   TTSRequest,
 } from "../types/api";
 
@@ -62,16 +63,36 @@ export async function createAppointment(
   });
 }
 
-export async function fetchTtsAudio(payload: TTSRequest): Promise<ArrayBuffer> {
+export async function fetchTtsAudio(
+  payload: TTSRequest,
+  signal?: AbortSignal,
+): Promise<ArrayBuffer> {
+  // Aborting closes the connection, which lets the backend cancel synthesis.
   const rawResponse = await fetch("/tts", {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
     },
     body: JSON.stringify(payload),
+    signal,
   });
 
   const response = await ensureOk(rawResponse);
 
   return response.arrayBuffer();
 }
+
+export async function fetchFaqAudioBundle(): Promise<Map<string, ArrayBuffer>> {
+  // The bundle URL is versioned and immutable, so repeat visits hit the HTTP cache.
+  const manifest = await apiRequest<FAQAudioBundleManifest>("/tts/faq-bundle", {
+    method: "GET",
+  });
+  const response = await ensureOk(await fetch(manifest.url));
+  const bundle = await response.arrayBuffer();
+
+  const clips = new Map<string, ArrayBuffer>();
+  for (const entry of manifest.entries) {
+    clips.set(entry.answer, bundle.slice(entry.offset, entry.offset + entry.length));
+  }
+  return clips;
+}
@@ -37,4 +37,26 @@ export type Appointment = AppointmentCreate & {
 export type TTSRequest = {
   text: string;
   voice_id?: string | null;
+  /**
+   * Optional encoding override: "mp3" | "mp3_low" | "opus" | "pcm".
+   * Mobile browsers get "mp3_low" automatically when omitted.
+   */
+  output_format?: string | null;
+};
+
+export type FAQAudioBundleEntry = {
+  question: string;
+  answer: string;
+  offset: number;
+  length: number;
+  media_type: string;
+  provider: string;
+};
+
+export type FAQAudioBundleManifest = {
+  version: string;
+  output_format: string;
+  url: string;
+  size: number;
+  entries: FAQAudioBundleEntry[];
 };